@@ -1,1724 +1,2615 @@
-"""
-Production-Ready Solana Arbitrage Bot
-Author: Solana Arbitrage System
-Version: 2.0.0
-"""
-
-import asyncio
-import aiohttp
-import json
-import os
-import time
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from decimal import Decimal, ROUND_DOWN
-from typing import Dict, List, Optional, Tuple, Any
-from enum import Enum
-import logging
-from concurrent.futures import ThreadPoolExecutor
-import signal
-import sys
-
-# Solana imports
-from solana.rpc import types
-from solana.rpc.async_api import AsyncClient
-from solana.transaction import Transaction
-from solana.rpc.commitment import Confirmed, Finalized
-from solders.keypair import Keypair
-from solders.pubkey import Pubkey
-from solders.system_program import TransferParams, transfer
-from solders.transaction import VersionedTransaction
-from solders.message import MessageV0
-from solders.instruction import Instruction, AccountMeta
-from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
-import base58
-import base64
-
-# Database
-import sqlite3
-from contextlib import asynccontextmanager
-
-# Monitoring
-import prometheus_client
-from prometheus_client import Counter, Histogram, Gauge
-
-# Import Jito client - Fixed import
-try:
-    from modules.jito_client import JitoClient, JitoConfig
-except ImportError:
-    # If running from src directory
-    try:
-        from .modules.jito_client import JitoClient, JitoConfig
-    except ImportError:
-        # Jito not available - will run without it
-        JitoClient = None
-        JitoConfig = None
-
-# Setup structured logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/arbitrage_bot.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
-
-# Metrics
-trade_counter = Counter('arbitrage_trades_total', 'Total number of arbitrage trades')
-profit_histogram = Histogram('arbitrage_profit_usd', 'Profit distribution in USD')
-opportunity_gauge = Gauge('arbitrage_opportunities_active', 'Current number of active opportunities')
-balance_gauge = Gauge('wallet_balance_usd', 'Current wallet balance in USD')
-
-class DEX(Enum):
-    JUPITER = "jupiter"
-    RAYDIUM = "raydium"
-    ORCA = "orca"
-    METEORA = "meteora"
-
-@dataclass
-class Token:
-    symbol: str
-    mint: str
-    decimals: int
-    min_liquidity: float = 10000.0  # Minimum liquidity in USD
-
-@dataclass
-class ArbitrageOpportunity:
-    id: str
-    token: Token
-    buy_dex: DEX
-    sell_dex: DEX
-    buy_price: Decimal
-    sell_price: Decimal
-    size_usd: Decimal
-    expected_profit: Decimal
-    price_impact: Decimal
-    timestamp: datetime
-    expires_at: datetime
-    
-    def is_valid(self) -> bool:
-        return datetime.utcnow() < self.expires_at
-
-@dataclass
-class TradeResult:
-    opportunity_id: str
-    success: bool
-    buy_tx: Optional[str]
-    sell_tx: Optional[str]
-    actual_profit: Optional[Decimal]
-    error: Optional[str]
-    gas_used: Decimal
-    execution_time: float
-
-class RateLimiter:
-    """Advanced rate limiter with burst support"""
-    def __init__(self, calls_per_second: int, burst: int = 5):
-        self.calls_per_second = calls_per_second
-        self.burst = burst
-        self.tokens = burst
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
-    
-    async def acquire(self):
-        async with self.lock:
-            now = time.time()
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst, self.tokens + elapsed * self.calls_per_second)
-            self.last_update = now
-            
-            if self.tokens < 1:
-                sleep_time = (1 - self.tokens) / self.calls_per_second
-                await asyncio.sleep(sleep_time)
-                self.tokens = 1
-            
-            self.tokens -= 1
-
-class PriceCache:
-    """In-memory price cache with TTL"""
-    def __init__(self, ttl_seconds: int = 5):
-        self.cache = {}
-        self.ttl = ttl_seconds
-    
-    def get(self, key: str) -> Optional[Any]:
-        if key in self.cache:
-            value, timestamp = self.cache[key]
-            if time.time() - timestamp < self.ttl:
-                return value
-            del self.cache[key]
-        return None
-    
-    def set(self, key: str, value: Any):
-        self.cache[key] = (value, time.time())
-    
-    def clear_expired(self):
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, timestamp) in self.cache.items()
-            if current_time - timestamp >= self.ttl
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-
-class TransactionBuilder:
-    """Build optimized transactions with priority fees"""
-    
-    @staticmethod
-    async def build_jupiter_swap(
-        client: AsyncClient,
-        wallet: Keypair,
-        input_mint: str,
-        output_mint: str,
-        amount: int,
-        slippage_bps: int = 50,
-        priority_fee: int = 10000  # microlamports
-    ) -> Optional[VersionedTransaction]:
-        """Build Jupiter swap transaction with priority fees"""
-        try:
-            # Get quote
-            async with aiohttp.ClientSession() as session:
-                quote_url = "https://quote-api.jup.ag/v6/quote"
-                params = {
-                    'inputMint': input_mint,
-                    'outputMint': output_mint,
-                    'amount': amount,
-                    'slippageBps': slippage_bps,
-                    'maxAccounts': 64
-                }
-                
-                async with session.get(quote_url, params=params) as response:
-                    if response.status != 200:
-                        return None
-                    quote = await response.json()
-                
-                # Get swap transaction
-                swap_url = "https://quote-api.jup.ag/v6/swap"
-                swap_data = {
-                    'quoteResponse': quote,
-                    'userPublicKey': str(wallet.pubkey()),
-                    'wrapAndUnwrapSol': True,
-                    'computeUnitPriceMicroLamports': priority_fee,
-                    'dynamicComputeUnitLimit': True
-                }
-                
-                async with session.post(swap_url, json=swap_data) as response:
-                    if response.status != 200:
-                        return None
-                    swap_response = await response.json()
-                
-                # Deserialize transaction
-                tx_data = base64.b64decode(swap_response['swapTransaction'])
-                return VersionedTransaction.from_bytes(tx_data)
-                
-        except Exception as e:
-            logger.error(f"Error building Jupiter swap: {e}")
-            return None
-    
-    @staticmethod
-    async def build_raydium_swap_via_jupiter(
-        client: AsyncClient,
-        wallet: Keypair,
-        input_mint: str,
-        output_mint: str,
-        amount: int,
-        slippage_bps: int = 50,
-        priority_fee: int = 10000
-    ) -> Optional[VersionedTransaction]:
-        """Build Raydium swap using Jupiter's routing (which includes Raydium)"""
-        try:
-            # Jupiter will automatically route through Raydium if it's the best price
-            async with aiohttp.ClientSession() as session:
-                quote_url = "https://quote-api.jup.ag/v6/quote"
-                params = {
-                    'inputMint': input_mint,
-                    'outputMint': output_mint,
-                    'amount': amount,
-                    'slippageBps': slippage_bps,
-                    'onlyDirectRoutes': 'true',  # Fixed: Changed from True to 'true'
-                    'maxAccounts': 64
-                }
-                
-                async with session.get(quote_url, params=params) as response:
-                    if response.status != 200:
-                        return None
-                    quote = await response.json()
-                
-                # Get swap transaction
-                swap_url = "https://quote-api.jup.ag/v6/swap"
-                swap_data = {
-                    'quoteResponse': quote,
-                    'userPublicKey': str(wallet.pubkey()),
-                    'wrapAndUnwrapSol': True,
-                    'computeUnitPriceMicroLamports': priority_fee,
-                    'dynamicComputeUnitLimit': True
-                }
-                
-                async with session.post(swap_url, json=swap_data) as response:
-                    if response.status != 200:
-                        return None
-                    swap_response = await response.json()
-                
-                # Deserialize transaction
-                tx_data = base64.b64decode(swap_response['swapTransaction'])
-                return VersionedTransaction.from_bytes(tx_data)
-                
-        except Exception as e:
-            logger.error(f"Error building Raydium swap via Jupiter: {e}")
-            return None
-
-class ArbitrageDatabase:
-    """SQLite database for trade history and analytics"""
-    
-    def __init__(self, db_path: str = "data/arbitrage.db"):
-        self.db_path = db_path
-        self._init_db()
-    
-    def _init_db(self):
-        """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id TEXT PRIMARY KEY,
-                opportunity_id TEXT,
-                token_symbol TEXT,
-                token_mint TEXT,
-                buy_dex TEXT,
-                sell_dex TEXT,
-                buy_price REAL,
-                sell_price REAL,
-                size_usd REAL,
-                expected_profit REAL,
-                actual_profit REAL,
-                buy_tx TEXT,
-                sell_tx TEXT,
-                success BOOLEAN,
-                error TEXT,
-                gas_used REAL,
-                execution_time REAL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS opportunities (
-                id TEXT PRIMARY KEY,
-                token_symbol TEXT,
-                token_mint TEXT,
-                buy_dex TEXT,
-                sell_dex TEXT,
-                buy_price REAL,
-                sell_price REAL,
-                size_usd REAL,
-                expected_profit REAL,
-                price_impact REAL,
-                discovered_at DATETIME,
-                expires_at DATETIME,
-                executed BOOLEAN DEFAULT FALSE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_token ON trades(token_mint)
-        """)
-        
-        conn.commit()
-        conn.close()
-    
-    async def save_opportunity(self, opp: ArbitrageOpportunity):
-        """Save discovered opportunity"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO opportunities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            opp.id,
-            opp.token.symbol,
-            opp.token.mint,
-            opp.buy_dex.value,
-            opp.sell_dex.value,
-            float(opp.buy_price),
-            float(opp.sell_price),
-            float(opp.size_usd),
-            float(opp.expected_profit),
-            float(opp.price_impact),
-            opp.timestamp,
-            opp.expires_at,
-            False
-        ))
-        
-        conn.commit()
-        conn.close()
-    
-    async def save_trade(self, opp: ArbitrageOpportunity, result: TradeResult):
-        """Save executed trade"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            f"trade_{int(time.time() * 1000000)}",
-            result.opportunity_id,
-            opp.token.symbol,
-            opp.token.mint,
-            opp.buy_dex.value,
-            opp.sell_dex.value,
-            float(opp.buy_price),
-            float(opp.sell_price),
-            float(opp.size_usd),
-            float(opp.expected_profit),
-            float(result.actual_profit) if result.actual_profit else None,
-            result.buy_tx,
-            result.sell_tx,
-            result.success,
-            result.error,
-            float(result.gas_used),
-            result.execution_time,
-            datetime.utcnow()
-        ))
-        
-        # Mark opportunity as executed
-        cursor.execute("""
-            UPDATE opportunities SET executed = TRUE WHERE id = ?
-        """, (opp.id,))
-        
-        conn.commit()
-        conn.close()
-        
-        # Update metrics
-        trade_counter.inc()
-        if result.actual_profit:
-            profit_histogram.observe(float(result.actual_profit))
-
-class ProductionArbitrageBot:
-    """Production-ready arbitrage bot with all features"""
-    
-    def __init__(self, config_path: str = "config/config.json"):
-        """Initialize the production bot"""
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
-        
-        # Initialize components
-        self.wallet = self._load_wallet()
-        self.client = AsyncClient(
-            self.config['rpc_endpoint'],
-            commitment=Confirmed
-        )
-        
-        # Tokens to monitor
-        self.tokens = self._load_tokens()
-        
-        # Rate limiters for each API
-        self.rate_limiters = {
-            DEX.JUPITER: RateLimiter(calls_per_second=10, burst=20),
-            DEX.RAYDIUM: RateLimiter(calls_per_second=5, burst=10),
-            "rpc": RateLimiter(calls_per_second=40, burst=50)
-        }
-        
-        # Price cache
-        self.price_cache = PriceCache(ttl_seconds=3)
-        
-        # Database
-        self.db = ArbitrageDatabase()
-        
-        # Trading parameters
-        self.min_profit_usd = Decimal(str(self.config.get('min_profit_usd', 10.0)))
-        self.max_position_size = Decimal(str(self.config.get('max_position_size', 5000.0)))
-        self.max_price_impact = Decimal(str(self.config.get('max_price_impact', 0.01)))  # 1%
-        self.min_price_difference = Decimal(str(self.config.get('min_price_difference', 0.007)))  # 0.7% default
-        self.priority_fee = self.config.get('priority_fee_microlamports', 10000)
-        
-        # TEMPORARY: Lower min profit for testing
-        if self.config.get('test_mode', True):
-            self.min_profit_usd = Decimal('0.001')  # $0.001 minimum for testing
-            logger.warning("TEST MODE: Minimum profit set to $0.001")
-        
-        # Risk management
-        self.max_daily_loss = Decimal(str(self.config.get('max_daily_loss', 100.0)))
-        self.daily_loss = Decimal('0')
-        self.last_loss_reset = datetime.utcnow()
-        
-        # State
-        self.running = False
-        self.active_opportunities = {}
-        self.execution_lock = asyncio.Lock()
-        
-        # Thread pool for CPU-intensive tasks
-        self.executor = ThreadPoolExecutor(max_workers=4)
-        
-        # Initialize Jito client if available
-        self.use_jito = self.config.get('use_jito_bundles', False) and JitoClient is not None
-        self.jito_client = None
-        
-        if self.use_jito:
-            try:
-                jito_config = JitoConfig()
-                self.jito_client = JitoClient(jito_config, self.client)
-                logger.info("Jito bundle support enabled")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Jito client: {e}")
-                self.use_jito = False
-                self.jito_client = None
-        
-        logger.info(f"Production bot initialized. Wallet: {self.wallet.pubkey()}")
-    
-    def _load_wallet(self) -> Keypair:
-        """Load wallet with proper security"""
-        wallet_path = self.config.get('wallet_path', 'wallet.json')
-        
-        # Try environment variable first (more secure)
-        if 'SOLANA_PRIVATE_KEY' in os.environ:
-            secret_key = base58.b58decode(os.environ['SOLANA_PRIVATE_KEY'])
-            return Keypair.from_bytes(secret_key)
-        
-        # Fall back to file
-        if os.path.exists(wallet_path):
-            with open(wallet_path, 'r') as f:
-                wallet_data = json.load(f)
-                # Handle both array format and object format
-                if isinstance(wallet_data, list):
-                    # Direct array of bytes
-                    return Keypair.from_bytes(wallet_data)
-                else:
-                    # Object with secret_key field
-                    secret_key = base58.b58decode(wallet_data['secret_key'])
-                    return Keypair.from_bytes(secret_key)
-        
-        raise ValueError("No wallet found. Set SOLANA_PRIVATE_KEY or create wallet.json")
-    
-    def _load_tokens(self) -> List[Token]:
-        """Load tokens from configuration"""
-        tokens = []
-        token_config = self.config.get('tokens', {})
-        
-        for symbol, info in token_config.items():
-            tokens.append(Token(
-                symbol=symbol,
-                mint=info['mint'],
-                decimals=info['decimals'],
-                min_liquidity=info.get('min_liquidity', 10000.0)
-            ))
-        
-        return tokens
-    
-    async def get_jupiter_price(self, token: Token) -> Optional[Tuple[Decimal, Decimal]]:
-        """Get token price and liquidity from Jupiter"""
-        cache_key = f"jupiter_{token.mint}"
-        cached = self.price_cache.get(cache_key)
-        if cached:
-            return cached
-        
-        await self.rate_limiters[DEX.JUPITER].acquire()
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                # Get price for 1 token worth in USD
-                amount = 10 ** token.decimals
-                
-                params = {
-                    'inputMint': token.mint,
-                    'outputMint': self.config['usdc_mint'],
-                    'amount': amount,
-                    'slippageBps': 50
-                }
-                
-                async with session.get(
-                    "https://quote-api.jup.ag/v6/quote",
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    data = await response.json()
-                    output_amount = Decimal(data['outAmount']) / Decimal(10 ** 6)  # USDC decimals
-                    price = output_amount
-                    
-                    # Estimate available liquidity (simplified)
-                    routes = data.get('routePlan', [])
-                    total_liquidity = sum(
-                        Decimal(route.get('outAmount', 0)) for route in routes
-                    ) * Decimal('100')  # Rough estimate
-                    
-                    result = (price, total_liquidity)
-                    self.price_cache.set(cache_key, result)
-                    return result
-                    
-        except Exception as e:
-            logger.error(f"Jupiter price error for {token.symbol}: {e}")
-            return None
-    
-    async def get_raydium_price(self, token: Token) -> Optional[Tuple[Decimal, Decimal]]:
-        """Get token price and liquidity from Raydium via DexScreener"""
-        cache_key = f"raydium_{token.mint}"
-        cached = self.price_cache.get(cache_key)
-        if cached:
-            return cached
-        
-        await self.rate_limiters[DEX.RAYDIUM].acquire()
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                headers = {'User-Agent': 'ArbitrageBot/2.0'}
-                
-                async with session.get(
-                    f"https://api.dexscreener.com/latest/dex/tokens/{token.mint}",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    data = await response.json()
-                    pairs = data.get('pairs', [])
-                    
-                    # Find Raydium USDC pair with highest liquidity
-                    raydium_pairs = [
-                        p for p in pairs 
-                        if p.get('dexId') == 'raydium' and 
-                        p.get('quoteToken', {}).get('symbol') in ['USDC', 'USDT']
-                    ]
-                    
-                    if not raydium_pairs:
-                        return None
-                    
-                    # Sort by liquidity
-                    best_pair = max(
-                        raydium_pairs,
-                        key=lambda p: float(p.get('liquidity', {}).get('usd', 0))
-                    )
-                    
-                    price = Decimal(best_pair.get('priceUsd', 0))
-                    liquidity = Decimal(best_pair.get('liquidity', {}).get('usd', 0))
-                    
-                    if price > 0 and liquidity > token.min_liquidity:
-                        result = (price, liquidity)
-                        self.price_cache.set(cache_key, result)
-                        return result
-                    
-                    return None
-                    
-        except Exception as e:
-            logger.error(f"Raydium price error for {token.symbol}: {e}")
-            return None
-    
-    async def calculate_price_impact(
-        self,
-        token: Token,
-        dex: DEX,
-        size_usd: Decimal
-    ) -> Decimal:
-        """Estimate price impact for a given trade size"""
-        # For small trades, use minimal impact
-        if size_usd <= 100:
-            return Decimal('0.0001')  # 0.01% for small trades
-        elif size_usd <= 1000:
-            return Decimal('0.0005')  # 0.05% for medium trades
-        else:
-            # Simplified model - in production, use actual DEX quotes
-            base_impact = Decimal('0.001')  # 0.1% base
-            return base_impact * (size_usd / Decimal('10000'))
-    
-    async def get_usdc_balance(self) -> float:
-        """Get USDC balance for the wallet"""
-        try:
-            from solana.rpc import types
-            
-            # Create proper opts object
-            opts = types.TokenAccountOpts(
-                mint=Pubkey.from_string(self.config['usdc_mint'])
-            )
-            
-            response = await self.client.get_token_accounts_by_owner_json_parsed(
-                self.wallet.pubkey(),
-                opts
-            )
-            
-            if response.value:
-                for account in response.value:
-                    try:
-                        parsed_info = account.account.data.parsed['info']
-                        balance = parsed_info['tokenAmount']['uiAmount']
-                        if balance and balance > 0:
-                            return float(balance)
-                    except Exception as e:
-                        logger.error(f"Error parsing token account: {e}")
-            return 0.0
-        except Exception as e:
-            logger.error(f"Error getting USDC balance: {e}")
-            return 0.0
-    
-    async def get_orca_price(self, token: Token) -> Optional[Tuple[Decimal, Decimal]]:
-        """Get token price from Orca via DexScreener"""
-        cache_key = f"orca_{token.mint}"
-        cached = self.price_cache.get(cache_key)
-        if cached:
-            return cached
-        
-        await self.rate_limiters[DEX.RAYDIUM].acquire()  # Use same limiter
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                headers = {'User-Agent': 'ArbitrageBot/2.0'}
-                
-                async with session.get(
-                    f"https://api.dexscreener.com/latest/dex/tokens/{token.mint}",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    data = await response.json()
-                    pairs = data.get('pairs', [])
-                    
-                    # Find Orca USDC pair
-                    orca_pairs = [
-                        p for p in pairs 
-                        if p.get('dexId') == 'orca' and 
-                        p.get('quoteToken', {}).get('symbol') in ['USDC', 'USDT']
-                    ]
-                    
-                    if not orca_pairs:
-                        return None
-                    
-                    best_pair = max(
-                        orca_pairs,
-                        key=lambda p: float(p.get('liquidity', {}).get('usd', 0))
-                    )
-                    
-                    price = Decimal(best_pair.get('priceUsd', 0))
-                    liquidity = Decimal(best_pair.get('liquidity', {}).get('usd', 0))
-                    
-                    if price > 0 and liquidity > token.min_liquidity:
-                        result = (price, liquidity)
-                        self.price_cache.set(cache_key, result)
-                        return result
-                    
-                    return None
-                    
-        except Exception as e:
-            logger.error(f"Orca price error for {token.symbol}: {e}")
-            return None
-    
-    async def get_meteora_price(self, token: Token) -> Optional[Tuple[Decimal, Decimal]]:
-        """Get token price from Meteora via DexScreener"""
-        cache_key = f"meteora_{token.mint}"
-        cached = self.price_cache.get(cache_key)
-        if cached:
-            return cached
-        
-        await self.rate_limiters[DEX.RAYDIUM].acquire()
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                headers = {'User-Agent': 'ArbitrageBot/2.0'}
-                
-                async with session.get(
-                    f"https://api.dexscreener.com/latest/dex/tokens/{token.mint}",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    data = await response.json()
-                    pairs = data.get('pairs', [])
-                    
-                    # Find Meteora USDC pair
-                    meteora_pairs = [
-                        p for p in pairs 
-                        if p.get('dexId') == 'meteora' and 
-                        p.get('quoteToken', {}).get('symbol') in ['USDC', 'USDT']
-                    ]
-                    
-                    if not meteora_pairs:
-                        return None
-                    
-                    best_pair = max(
-                        meteora_pairs,
-                        key=lambda p: float(p.get('liquidity', {}).get('usd', 0))
-                    )
-                    
-                    price = Decimal(best_pair.get('priceUsd', 0))
-                    liquidity = Decimal(best_pair.get('liquidity', {}).get('usd', 0))
-                    
-                    if price > 0 and liquidity > token.min_liquidity:
-                        result = (price, liquidity)
-                        self.price_cache.set(cache_key, result)
-                        return result
-                    
-                    return None
-                    
-        except Exception as e:
-            logger.error(f"Meteora price error for {token.symbol}: {e}")
-            return None
-        """Get USDC balance for the wallet"""
-        try:
-            from solana.rpc import types
-            
-            # Create proper opts object
-            opts = types.TokenAccountOpts(
-                mint=Pubkey.from_string(self.config['usdc_mint'])
-            )
-            
-            response = await self.client.get_token_accounts_by_owner_json_parsed(
-                self.wallet.pubkey(),
-                opts
-            )
-            
-            if response.value:
-                for account in response.value:
-                    try:
-                        parsed_info = account.account.data.parsed['info']
-                        balance = parsed_info['tokenAmount']['uiAmount']
-                        if balance and balance > 0:
-                            return float(balance)
-                    except Exception as e:
-                        logger.error(f"Error parsing token account: {e}")
-            return 0.0
-        except Exception as e:
-            logger.error(f"Error getting USDC balance: {e}")
-            return 0.0
-    
-    async def find_arbitrage_opportunities(self) -> List[ArbitrageOpportunity]:
-        """Find all profitable arbitrage opportunities"""
-        opportunities = []
-        
-        # Get current USDC balance to limit position sizes
-        usdc_balance = await self.get_usdc_balance()
-        logger.debug(f"Current USDC balance: ${usdc_balance:.2f}")
-        
-        for token in self.tokens:
-            try:
-                # Get prices from all DEXs
-                jupiter_data = await self.get_jupiter_price(token)
-                raydium_data = await self.get_raydium_price(token)
-                orca_data = await self.get_orca_price(token)
-                meteora_data = await self.get_meteora_price(token)
-                
-                # Collect all valid prices
-                all_prices = []
-                if jupiter_data:
-                    all_prices.append((DEX.JUPITER, jupiter_data[0], jupiter_data[1]))
-                if raydium_data:
-                    all_prices.append((DEX.RAYDIUM, raydium_data[0], raydium_data[1]))
-                if orca_data:
-                    all_prices.append((DEX.ORCA, orca_data[0], orca_data[1]))
-                if meteora_data:
-                    all_prices.append((DEX.METEORA, meteora_data[0], meteora_data[1]))
-                
-                # Need at least 2 DEXs to arbitrage
-                if len(all_prices) < 2:
-                    logger.debug(f"{token.symbol}: Not enough DEX prices ({len(all_prices)} DEXs)")
-                    continue
-                
-                # Find best arbitrage opportunity across all DEX pairs
-                best_opportunity = None
-                best_diff_pct = Decimal('0')
-                
-                for i in range(len(all_prices)):
-                    for j in range(i + 1, len(all_prices)):
-                        dex1, price1, liquidity1 = all_prices[i]
-                        dex2, price2, liquidity2 = all_prices[j]
-                        
-                        price_diff = abs(price1 - price2)
-                        price_diff_pct = (price_diff / min(price1, price2)) * Decimal('100')
-                        
-                        if price_diff_pct > best_diff_pct and price_diff_pct >= self.min_price_difference * 100:
-                            if price1 < price2:
-                                buy_dex, sell_dex = dex1, dex2
-                                buy_price, sell_price = price1, price2
-                            else:
-                                buy_dex, sell_dex = dex2, dex1
-                                buy_price, sell_price = price2, price1
-                            
-                            available_liquidity = min(liquidity1, liquidity2)
-                            best_diff_pct = price_diff_pct
-                            best_opportunity = (buy_dex, sell_dex, buy_price, sell_price, available_liquidity, price_diff_pct)
-                
-                if not best_opportunity:
-                    logger.debug(f"{token.symbol}: No profitable DEX pairs found")
-                    continue
-                
-                buy_dex, sell_dex, buy_price, sell_price, available_liquidity, price_diff_pct = best_opportunity
-                
-                logger.info(f"{token.symbol}: Buy on {buy_dex.value} at ${buy_price:.8f}, Sell on {sell_dex.value} at ${sell_price:.8f} ({price_diff_pct:.2f}%)")
-                
-                # Calculate optimal position size
-                max_size_by_balance = Decimal(str(usdc_balance)) * Decimal('0.5')  # Use max 50% of balance to avoid getting stuck
-                max_size_by_config = self.max_position_size
-                max_size_by_liquidity = available_liquidity * Decimal('0.1')  # Use max 10% of liquidity
-                
-                # For tokens with low liquidity estimates from Jupiter, use a minimum
-                if token.symbol in ['BONK', 'WIF', 'POPCAT', 'MEME']:
-                    max_size_by_liquidity = max(max_size_by_liquidity, Decimal('1000'))  # At least $1000
-                
-                max_size = min(max_size_by_balance, max_size_by_config, max_size_by_liquidity)
-                
-                logger.info(f"{token.symbol}: Max size - Balance: ${max_size_by_balance:.2f}, Config: ${max_size_by_config:.2f}, Liquidity: ${max_size_by_liquidity:.2f} -> Using: ${max_size:.2f}")
-                
-                # Dynamic trade sizes based on available balance
-                if usdc_balance < 100:
-                    trade_sizes = [10, 15, 20, 25, 30, 40, 50]
-                elif usdc_balance < 500:
-                    trade_sizes = [20, 50, 100, 150, 200, 300]
-                else:
-                    trade_sizes = [50, 100, 200, 500, 1000, 2000]
-                
-                # Calculate expected profit for different sizes
-                for size in trade_sizes:
-                    size_usd = Decimal(str(size))
-                    if size_usd > max_size:
-                        logger.debug(f"{token.symbol}: Size ${size_usd} exceeds max size ${max_size}")
-                        break
-                    
-                    # Estimate price impact
-                    buy_impact = await self.calculate_price_impact(token, buy_dex, size_usd)
-                    sell_impact = await self.calculate_price_impact(token, sell_dex, size_usd)
-                    total_impact = buy_impact + sell_impact
-                    
-                    # Skip if impact too high
-                    if total_impact > self.max_price_impact:
-                        logger.debug(f"{token.symbol}: Price impact too high ({total_impact:.4f} > {self.max_price_impact})")
-                        continue
-                    
-                    # Calculate profit
-                    effective_buy_price = buy_price * (Decimal('1') + buy_impact)
-                    effective_sell_price = sell_price * (Decimal('1') - sell_impact)
-                    
-                    tokens = size_usd / effective_buy_price
-                    revenue = tokens * effective_sell_price
-                    
-                    # Estimate fees
-                    # Use realistic Jupiter fees
-                    swap_fees = size_usd * Decimal('0.0025') * 2  # 0.25% each way = 0.5% total
-                    # Realistic gas fees (increased for safety)
-                    gas_fees = Decimal('0.00003') * 150  # 0.00003 SOL × $150 = $0.0045 per transaction × 2 = $0.009
-                    
-                    gross_profit = revenue - size_usd
-                    net_profit = gross_profit - swap_fees - gas_fees
-                    
-                    # Additional profit validation
-                    profit_margin = net_profit / size_usd * 100  # Profit as percentage of investment
-                    
-                    # Always log profit calculations for debugging
-                    logger.info(f"{token.symbol}: Size ${size_usd}")
-                    logger.info(f"  Buy price: ${buy_price:.8f}, Sell price: ${sell_price:.8f}")
-                    logger.info(f"  Price diff: {price_diff_pct:.3f}%")
-                    logger.info(f"  Gross profit: ${gross_profit:.6f}")
-                    logger.info(f"  Swap fees: ${swap_fees:.6f}")
-                    logger.info(f"  Gas fees: ${gas_fees:.6f}")
-                    logger.info(f"  Net profit: ${net_profit:.6f}")
-                    logger.info(f"  Profit margin: {profit_margin:.3f}%")
-                    logger.info(f"  Min required: ${self.min_profit_usd}")
-                    
-                    # Extra validation: ensure profit margin is at least 1%
-                    min_profit_margin = Decimal('1.0')  # 1% minimum profit margin
-                    
-                    if net_profit >= self.min_profit_usd and profit_margin >= min_profit_margin:
-                        opportunity = ArbitrageOpportunity(
-                            id=f"{token.symbol}_{int(time.time() * 1000000)}",
-                            token=token,
-                            buy_dex=buy_dex,
-                            sell_dex=sell_dex,
-                            buy_price=buy_price,
-                            sell_price=sell_price,
-                            size_usd=size_usd,
-                            expected_profit=net_profit,
-                            price_impact=total_impact,
-                            timestamp=datetime.utcnow(),
-                            expires_at=datetime.utcnow() + timedelta(seconds=10)
-                        )
-                        
-                        opportunities.append(opportunity)
-                        await self.db.save_opportunity(opportunity)
-                        
-                        logger.info(f"OPPORTUNITY FOUND: {token.symbol} - Size: ${size_usd}, Expected profit: ${net_profit:.2f} ({profit_margin:.2f}% margin)")
-                        break  # Found profitable size, move to next token
-                    else:
-                        if net_profit < self.min_profit_usd:
-                            logger.info(f"{token.symbol}: Not profitable enough. Net profit ${net_profit:.4f} < Required ${self.min_profit_usd}")
-                        else:
-                            logger.info(f"{token.symbol}: Profit margin too low. {profit_margin:.3f}% < Required {min_profit_margin}%")
-                
-            except Exception as e:
-                logger.error(f"Error finding opportunities for {token.symbol}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        # Update metrics
-        opportunity_gauge.set(len(opportunities))
-        
-        if opportunities:
-            logger.info(f"Found {len(opportunities)} total opportunities")
-        
-        return opportunities
-    
-    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> TradeResult:
-        """Execute an arbitrage opportunity with safety checks"""
-        start_time = time.time()
-        
-        # Check if still valid
-        if not opportunity.is_valid():
-            return TradeResult(
-                opportunity_id=opportunity.id,
-                success=False,
-                buy_tx=None,
-                sell_tx=None,
-                actual_profit=None,
-                error="Opportunity expired",
-                gas_used=Decimal('0'),
-                execution_time=0
-            )
-        
-        # Risk check
-        if self.daily_loss >= self.max_daily_loss:
-            return TradeResult(
-                opportunity_id=opportunity.id,
-                success=False,
-                buy_tx=None,
-                sell_tx=None,
-                actual_profit=None,
-                error="Daily loss limit reached",
-                gas_used=Decimal('0'),
-                execution_time=0
-            )
-        
-        async with self.execution_lock:
-            try:
-                logger.info(f"Executing arbitrage: {opportunity.token.symbol}")
-                logger.info(f"Buy on {opportunity.buy_dex.value} at {opportunity.buy_price}")
-                logger.info(f"Sell on {opportunity.sell_dex.value} at {opportunity.sell_price}")
-                logger.info(f"Expected profit: ${opportunity.expected_profit}")
-                
-                # Final profit validation before execution
-                min_profit_margin = Decimal('1.0')  # 1% minimum
-                expected_margin = (opportunity.expected_profit / opportunity.size_usd) * 100
-                
-                if expected_margin < min_profit_margin:
-                    logger.warning(f"Skipping trade: profit margin {expected_margin:.2f}% below minimum {min_profit_margin}%")
-                    raise Exception(f"Profit margin too low: {expected_margin:.2f}%")
-                
-                # Re-verify opportunity is still profitable before execution
-                logger.info("Re-verifying prices before execution...")
-                
-                # Get fresh prices
-                fresh_jupiter_data = await self.get_jupiter_price(opportunity.token)
-                fresh_raydium_data = await self.get_raydium_price(opportunity.token)
-                
-                if not fresh_jupiter_data or not fresh_raydium_data:
-                    raise Exception("Failed to get fresh prices for verification")
-                
-                fresh_jupiter_price, _ = fresh_jupiter_data
-                fresh_raydium_price, _ = fresh_raydium_data
-                
-                # Determine current buy/sell prices
-                if opportunity.buy_dex == DEX.JUPITER:
-                    current_buy_price = fresh_jupiter_price
-                    current_sell_price = fresh_raydium_price
-                else:
-                    current_buy_price = fresh_raydium_price
-                    current_sell_price = fresh_jupiter_price
-                
-                # Calculate fresh profit
-                fresh_price_diff = abs(current_sell_price - current_buy_price)
-                fresh_price_diff_pct = (fresh_price_diff / current_buy_price) * Decimal('100')
-                
-                logger.info(f"Fresh prices - Buy: ${current_buy_price:.8f}, Sell: ${current_sell_price:.8f}, Diff: {fresh_price_diff_pct:.3f}%")
-                
-                # Abort if spread has narrowed too much
-                min_required_spread = Decimal('1.2')  # 1.2% minimum to account for fees and slippage
-                if fresh_price_diff_pct < min_required_spread:
-                    raise Exception(f"Price spread too narrow: {fresh_price_diff_pct:.3f}% < {min_required_spread}% required")
-                
-                # Get wallet balance
-                await self.rate_limiters["rpc"].acquire()
-                balance_response = await self.client.get_balance(self.wallet.pubkey())
-                sol_balance = balance_response.value / 1e9
-                
-                if sol_balance < 0.1:  # Need at least 0.1 SOL for fees
-                    raise Exception("Insufficient SOL balance for fees")
-                
-                # Check USDC balance
-                usdc_balance = await self.get_usdc_balance()
-                logger.info(f"USDC Balance: ${usdc_balance:.2f}")
-                
-                if usdc_balance < float(opportunity.size_usd):
-                    raise Exception(f"Insufficient USDC balance. Have ${usdc_balance:.2f}, need ${opportunity.size_usd}")
-                
-                # Use Jito if available and profitable enough
-                min_profit_for_jito = Decimal(str(self.config.get('min_profit_for_jito', 50.0)))
-                if self.use_jito and self.jito_client and float(opportunity.expected_profit) > float(min_profit_for_jito):
-                    logger.info("Using Jito bundle for atomic execution")
-                    
-                    # Build both transactions
-                    buy_amount = int(opportunity.size_usd * Decimal('1000000'))  # USDC has 6 decimals
-                    
-                    # Build buy transaction
-                    if opportunity.buy_dex == DEX.JUPITER:
-                        buy_tx = await TransactionBuilder.build_jupiter_swap(
-                            self.client,
-                            self.wallet,
-                            self.config['usdc_mint'],
-                            opportunity.token.mint,
-                            buy_amount,
-                            slippage_bps=100,
-                            priority_fee=0  # No priority fee needed with Jito
-                        )
-                    else:
-                        buy_tx = None
-                    
-                    if not buy_tx:
-                        raise Exception("Failed to build buy transaction")
-                    
-                    # Build sell transaction
-                    tokens_received = opportunity.size_usd / opportunity.buy_price
-                    sell_amount = int(tokens_received * Decimal(10 ** opportunity.token.decimals))
-                    
-                    if opportunity.sell_dex == DEX.JUPITER:
-                        sell_tx = await TransactionBuilder.build_jupiter_swap(
-                            self.client,
-                            self.wallet,
-                            opportunity.token.mint,
-                            self.config['usdc_mint'],
-                            sell_amount,
-                            slippage_bps=100,
-                            priority_fee=0
-                        )
-                    else:
-                        sell_tx = None
-                    
-                    if not sell_tx:
-                        raise Exception("Failed to build sell transaction")
-                    
-                    # Calculate tip for Jito
-                    expected_profit_lamports = int(float(opportunity.expected_profit) * 1e9 / 150)  # Assuming SOL = $150
-                    tip_lamports = self.jito_client.calculate_optimal_tip(expected_profit_lamports)
-                    
-                    # Build bundle with tip in last transaction
-                    bundle_txs = await self.jito_client.build_bundle_transactions(
-                        [[buy_tx.message.instructions], [sell_tx.message.instructions]],
-                        self.wallet,
-                        tip_lamports
-                    )
-                    
-                    # Send bundle
-                    success, bundle_id, error = await self.jito_client.send_bundle(bundle_txs)
-                    
-                    if success:
-                        # Wait for confirmation
-                        confirmed = await self.jito_client.wait_for_bundle_confirmation(bundle_id, timeout=30)
-                        
-                        if confirmed:
-                            gas_used = Decimal(str(tip_lamports / 1e9))  # Convert tip to SOL
-                            actual_profit = opportunity.expected_profit - gas_used * 150  # SOL to USD
-                            
-                            result = TradeResult(
-                                opportunity_id=opportunity.id,
-                                success=True,
-                                buy_tx=f"jito_bundle_{bundle_id}",
-                                sell_tx=f"jito_bundle_{bundle_id}",
-                                actual_profit=actual_profit,
-                                error=None,
-                                gas_used=gas_used,
-                                execution_time=time.time() - start_time
-                            )
-                            
-                            logger.info(f"Jito bundle executed successfully! Bundle ID: {bundle_id}")
-                            logger.info(f"Actual profit: ${actual_profit}")
-                        else:
-                            raise Exception(f"Bundle not confirmed: {bundle_id}")
-                    else:
-                        raise Exception(f"Failed to send bundle: {error}")
-                    
-                else:
-                    # Original sequential execution
-                    logger.info("Using sequential transaction execution")
-                    
-                    # Execute buy transaction
-                    buy_amount = int(opportunity.size_usd * Decimal('1000000'))  # USDC has 6 decimals
-
-                    if opportunity.buy_dex == DEX.JUPITER:
-                        buy_tx = await TransactionBuilder.build_jupiter_swap(
-                            self.client,
-                            self.wallet,
-                            self.config['usdc_mint'],
-                            opportunity.token.mint,
-                            buy_amount,
-                            slippage_bps=100,  # 1% slippage
-                            priority_fee=self.priority_fee
-                        )
-                    else:
-                        # Use Jupiter routing for Raydium
-                        buy_tx = await TransactionBuilder.build_raydium_swap_via_jupiter(
-                            self.client,
-                            self.wallet,
-                            self.config['usdc_mint'],
-                            opportunity.token.mint,
-                            buy_amount,
-                            slippage_bps=100,
-                            priority_fee=self.priority_fee
-                        )
-                    
-                    if not buy_tx:
-                        raise Exception("Failed to build buy transaction")
-                    
-                    # Sign and send buy transaction
-                    try:
-                        # For VersionedTransaction from Jupiter, we need to handle it carefully
-                        from solders.transaction import VersionedTransaction as VT
-                        from solders.keypair import Keypair as SoldersKeypair
-                        
-                        # Convert our keypair to solders format if needed
-                        if hasattr(self.wallet, 'secret_key'):
-                            signer_keypair = SoldersKeypair.from_bytes(self.wallet.secret_key)
-                        else:
-                            signer_keypair = self.wallet
-                        
-                        # Create a new VersionedTransaction with the signer
-                        signed_tx = VT(buy_tx.message, [signer_keypair])
-                        
-                        await self.rate_limiters["rpc"].acquire()
-                        logger.info(f"Sending buy transaction...")
-                        
-                        # Send the raw transaction
-                        tx_bytes = bytes(signed_tx)
-                        buy_result = await self.client.send_raw_transaction(tx_bytes)
-                        buy_tx_id = str(buy_result.value)
-                        
-                    except Exception as e:
-                        logger.error(f"Error signing/sending buy transaction: {e}")
-                        raise
-                    
-                    logger.info(f"Buy transaction sent: {buy_tx_id}")
-                    
-                    # Wait for confirmation with proper error handling
-                    max_retries = 15  # Reduced from 30 to speed up
-                    for i in range(max_retries):
-                        await asyncio.sleep(0.5)  # Reduced from 1 second
-                        try:
-                            status = await self.client.get_signature_statuses([buy_result.value])
-                            if status.value[0] is not None:
-                                if status.value[0].err:
-                                    raise Exception(f"Buy transaction failed: {status.value[0].err}")
-                                if status.value[0].confirmation_status in ["confirmed", "finalized"]:
-                                    logger.info(f"Buy transaction confirmed after {(i+1)*0.5} seconds")
-                                    break
-                        except Exception as e:
-                            if i == max_retries - 1:
-                                raise Exception(f"Buy transaction confirmation timeout: {e}")
-                            continue
-                    
-                    # TODO: Get actual token balance received
-                    # For now, estimate based on expected price
-                    tokens_received = opportunity.size_usd / opportunity.buy_price
-                    sell_amount = int(tokens_received * Decimal(10 ** opportunity.token.decimals))
-                    
-                    # Execute sell transaction
-                    logger.info(f"Building sell transaction for {sell_amount} tokens (raw amount)")
-                    
-                    if opportunity.sell_dex == DEX.JUPITER:
-                        sell_tx = await TransactionBuilder.build_jupiter_swap(
-                            self.client,
-                            self.wallet,
-                            opportunity.token.mint,
-                            self.config['usdc_mint'],
-                            sell_amount,
-                            slippage_bps=200,  # Increased slippage to 2%
-                            priority_fee=self.priority_fee
-                        )
-                    else:
-                        # Use Jupiter routing for Raydium
-                        sell_tx = await TransactionBuilder.build_raydium_swap_via_jupiter(
-                            self.client,
-                            self.wallet,
-                            opportunity.token.mint,
-                            self.config['usdc_mint'],
-                            sell_amount,
-                            slippage_bps=200,  # Increased slippage to 2%
-                            priority_fee=self.priority_fee
-                        )
-                    
-                    if not sell_tx:
-                        raise Exception("Failed to build sell transaction")
-                    
-                    # Wait a bit before selling to ensure token balance is settled
-                    await asyncio.sleep(1)  # Reduced from 3 seconds
-                    
-                    # Double check token balance before selling
-                    logger.info("Verifying token balance before sell...")
-                    opts = types.TokenAccountOpts(
-                        mint=Pubkey.from_string(opportunity.token.mint)
-                    )
-                    
-                    token_accounts = await self.client.get_token_accounts_by_owner_json_parsed(
-                        self.wallet.pubkey(),
-                        opts
-                    )
-                    
-                    verified_balance = 0
-                    if token_accounts.value:
-                        for account in token_accounts.value:
-                            try:
-                                parsed_info = account.account.data.parsed['info']
-                                balance = parsed_info['tokenAmount']['amount']
-                                verified_balance = int(balance)
-                                logger.info(f"Verified token balance: {verified_balance}")
-                                break
-                            except Exception as e:
-                                logger.error(f"Error verifying balance: {e}")
-                    
-                    if verified_balance < sell_amount:
-                        logger.warning(f"Adjusting sell amount from {sell_amount} to {verified_balance}")
-                        sell_amount = verified_balance
-                        
-                        # Rebuild transaction with correct amount
-                        if opportunity.sell_dex == DEX.JUPITER:
-                            sell_tx = await TransactionBuilder.build_jupiter_swap(
-                                self.client,
-                                self.wallet,
-                                opportunity.token.mint,
-                                self.config['usdc_mint'],
-                                sell_amount,
-                                slippage_bps=200,
-                                priority_fee=self.priority_fee
-                            )
-                        else:
-                            sell_tx = await TransactionBuilder.build_raydium_swap_via_jupiter(
-                                self.client,
-                                self.wallet,
-                                opportunity.token.mint,
-                                self.config['usdc_mint'],
-                                sell_amount,
-                                slippage_bps=200,
-                                priority_fee=self.priority_fee
-                            )
-                    
-                    if not sell_tx:
-                        raise Exception("Failed to build sell transaction")
-                    
-                    # Sign and send sell transaction using the same method as buy
-                    try:
-                        from solders.transaction import VersionedTransaction as VT
-                        from solders.keypair import Keypair as SoldersKeypair
-                        
-                        # Convert our keypair to solders format if needed
-                        if hasattr(self.wallet, 'secret_key'):
-                            signer_keypair = SoldersKeypair.from_bytes(self.wallet.secret_key)
-                        else:
-                            signer_keypair = self.wallet
-                        
-                        # Create a new VersionedTransaction with the signer
-                        signed_tx = VT(sell_tx.message, [signer_keypair])
-                        
-                        await self.rate_limiters["rpc"].acquire()
-                        logger.info(f"Sending sell transaction with amount: {sell_amount}")
-                        
-                        # Send the raw transaction
-                        tx_bytes = bytes(signed_tx)
-                        sell_result = await self.client.send_raw_transaction(tx_bytes)
-                        sell_tx_id = str(sell_result.value)
-                        
-                        logger.info(f"Sell transaction sent: {sell_tx_id}")
-                        
-                        # Wait for confirmation
-                        await asyncio.sleep(2)
-                        
-                    except Exception as e:
-                        logger.error(f"Error signing/sending sell transaction: {e}")
-                        # Log more details about the error
-                        if "Custom program error" in str(e):
-                            logger.error("This usually means insufficient token balance or slippage")
-                            logger.error(f"Attempted to sell {sell_amount} tokens")
-                        raise
-                    
-                    logger.info(f"Sell transaction sent: {sell_tx_id}")
-                    
-                    # Wait for sell confirmation
-                    await asyncio.sleep(5)
-                    
-                    # Get actual USDC balance after trades to calculate real profit
-                    final_usdc_balance = await self.get_usdc_balance()
-                    usdc_received = Decimal(str(final_usdc_balance)) - Decimal(str(usdc_balance)) + opportunity.size_usd
-                    
-                    # Calculate actual profit based on real results
-                    gas_used = Decimal('0.00001') * 2  # Approximate gas for both transactions
-                    actual_profit = usdc_received - opportunity.size_usd - (gas_used * 150)  # Convert gas to USD
-                    
-                    logger.info(f"Trade complete:")
-                    logger.info(f"  Started with: ${opportunity.size_usd} USDC")
-                    logger.info(f"  Received: ${usdc_received} USDC")
-                    logger.info(f"  Gas cost: ${gas_used * 150:.4f}")
-                    logger.info(f"  Actual profit/loss: ${actual_profit:.4f}")
-                    
-                    result = TradeResult(
-                        opportunity_id=opportunity.id,
-                        success=True,
-                        buy_tx=buy_tx_id,
-                        sell_tx=sell_tx_id,
-                        actual_profit=actual_profit,
-                        error=None,
-                        gas_used=gas_used,
-                        execution_time=time.time() - start_time
-                    )
-                    
-                    if actual_profit < 0:
-                        logger.warning(f"Trade resulted in loss of ${abs(actual_profit):.4f}")
-                        self.daily_loss += abs(actual_profit)
-                        
-                        # Analyze why the trade failed
-                        logger.warning("Trade analysis:")
-                        logger.warning(f"  Expected profit: ${opportunity.expected_profit:.4f}")
-                        logger.warning(f"  Actual profit: ${actual_profit:.4f}")
-                        logger.warning(f"  Difference: ${opportunity.expected_profit - actual_profit:.4f}")
-                        logger.warning(f"  Execution time: {result.execution_time:.1f} seconds")
-                        
-                        # Log current prices to see if market moved
-                        current_jupiter = await self.get_jupiter_price(opportunity.token)
-                        current_raydium = await self.get_raydium_price(opportunity.token)
-                        if current_jupiter and current_raydium:
-                            j_price, _ = current_jupiter
-                            r_price, _ = current_raydium
-                            logger.warning(f"  Current prices - Jupiter: ${j_price:.8f}, Raydium: ${r_price:.8f}")
-                            logger.warning(f"  Original prices - Buy: ${opportunity.buy_price:.8f}, Sell: ${opportunity.sell_price:.8f}")
-                
-            except Exception as e:
-                logger.error(f"Arbitrage execution failed: {e}")
-                
-                result = TradeResult(
-                    opportunity_id=opportunity.id,
-                    success=False,
-                    buy_tx=None,
-                    sell_tx=None,
-                    actual_profit=None,
-                    error=str(e),
-                    gas_used=Decimal('0.005'),  # Failed tx still costs gas
-                    execution_time=time.time() - start_time
-                )
-                
-                # Update daily loss
-                self.daily_loss += Decimal('10')  # Assume $10 loss on failed trade
-            
-            # Save trade result
-            await self.db.save_trade(opportunity, result)
-            
-            return result
-    
-    async def check_and_rebalance_usdc(self, min_usdc_needed: float = 20.0) -> bool:
-        """Check USDC balance and rebalance if needed"""
-        try:
-            usdc_balance = await self.get_usdc_balance()
-            
-            if usdc_balance < min_usdc_needed:
-                logger.info(f"USDC balance ${usdc_balance:.2f} below minimum ${min_usdc_needed}")
-                
-                # Get all token balances
-                for token in self.tokens:
-                    opts = types.TokenAccountOpts(
-                        mint=Pubkey.from_string(token.mint)
-                    )
-                    
-                    token_accounts = await self.client.get_token_accounts_by_owner_json_parsed(
-                        self.wallet.pubkey(),
-                        opts
-                    )
-                    
-                    if token_accounts.value:
-                        for account in token_accounts.value:
-                            try:
-                                parsed_info = account.account.data.parsed['info']
-                                balance = parsed_info['tokenAmount']['uiAmount']
-                                if balance and balance > 0:
-                                    # Get current price
-                                    jupiter_data = await self.get_jupiter_price(token)
-                                    if jupiter_data:
-                                        price, _ = jupiter_data
-                                        value_usd = float(balance) * float(price)
-                                        
-                                        if value_usd > 5:  # Only rebalance if worth more than $5
-                                            logger.info(f"Found {balance} {token.symbol} worth ${value_usd:.2f}")
-                                            
-                                            # Sell half to USDC
-                                            sell_amount = int(float(balance) * 0.5 * (10 ** token.decimals))
-                                            
-                                            sell_tx = await TransactionBuilder.build_jupiter_swap(
-                                                self.client,
-                                                self.wallet,
-                                                token.mint,
-                                                self.config['usdc_mint'],
-                                                sell_amount,
-                                                slippage_bps=100,
-                                                priority_fee=self.priority_fee
-                                            )
-                                            
-                                            if sell_tx:
-                                                # Sign and send
-                                                from solders.transaction import VersionedTransaction as VT
-                                                signed_tx = VT(sell_tx.message, [self.wallet])
-                                                tx_bytes = bytes(signed_tx)
-                                                result = await self.client.send_raw_transaction(tx_bytes)
-                                                
-                                                logger.info(f"Rebalanced {token.symbol} to USDC: {result.value}")
-                                                await asyncio.sleep(5)  # Wait for confirmation
-                                                return True
-                                                
-                            except Exception as e:
-                                logger.error(f"Error checking {token.symbol} balance: {e}")
-                
-            return usdc_balance >= min_usdc_needed
-            
-        except Exception as e:
-            logger.error(f"Rebalancing error: {e}")
-            return False
-    
-    async def health_check(self):
-        """Periodic health check"""
-        while self.running:
-            try:
-                # Check RPC connection
-                await self.rate_limiters["rpc"].acquire()
-                block_height = await self.client.get_block_height()
-                
-                # Check wallet balance
-                balance_response = await self.client.get_balance(self.wallet.pubkey())
-                sol_balance = balance_response.value / 1e9
-                
-                # Estimate USD value (simplified)
-                usd_value = sol_balance * 150  # Assume $150/SOL
-                balance_gauge.set(usd_value)
-                
-                # Reset daily loss counter if new day
-                if datetime.utcnow().date() > self.last_loss_reset.date():
-                    self.daily_loss = Decimal('0')
-                    self.last_loss_reset = datetime.utcnow()
-                
-                # Clear expired cache entries
-                self.price_cache.clear_expired()
-                
-                logger.info(f"Health check OK. Block: {block_height.value}, Balance: {sol_balance:.4f} SOL")
-                
-            except Exception as e:
-                logger.error(f"Health check failed: {e}")
-            
-            await asyncio.sleep(60)  # Check every minute
-    
-    async def monitor_loop(self):
-        """Main monitoring loop"""
-        logger.info("Starting production arbitrage monitor...")
-        
-        # Check USDC balance at start
-        usdc_balance = await self.get_usdc_balance()
-        logger.info(f"Starting USDC balance: ${usdc_balance:.2f}")
-        
-        consecutive_errors = 0
-        checks_count = 0
-        
-        while self.running:
-            try:
-                checks_count += 1
-                logger.info(f"[Check #{checks_count}] Scanning for arbitrage opportunities...")
-                
-                # Find opportunities
-                opportunities = await self.find_arbitrage_opportunities()
-                
-                # Check if we need to rebalance USDC before executing trades
-                if len(opportunities) > 0:
-                    usdc_balance = await self.get_usdc_balance()
-                    if usdc_balance < 10:  # Below minimum trade size
-                        logger.info("Low USDC balance, attempting to rebalance...")
-                        rebalanced = await self.check_and_rebalance_usdc(min_usdc_needed=20.0)
-                        if rebalanced:
-                            logger.info("Rebalancing successful, continuing with trades")
-                        else:
-                            logger.warning("Could not rebalance, skipping this cycle")
-                            await asyncio.sleep(30)
-                            continue
-                
-                if opportunities:
-                    logger.info(f"Found {len(opportunities)} opportunities")
-                    
-                    # Sort by profit
-                    opportunities.sort(key=lambda x: x.expected_profit, reverse=True)
-                    
-                    # Log each opportunity
-                    for i, opp in enumerate(opportunities):
-                        logger.info(f"  Opportunity {i+1}: {opp.token.symbol}")
-                        logger.info(f"    Buy on {opp.buy_dex.value} at ${opp.buy_price:.8f}")
-                        logger.info(f"    Sell on {opp.sell_dex.value} at ${opp.sell_price:.8f}")
-                        logger.info(f"    Size: ${opp.size_usd}, Expected profit: ${opp.expected_profit:.2f}")
-                    
-                    # Execute top opportunities in parallel (max 3)
-                    tasks = []
-                    for opp in opportunities[:1]:  # Changed from [:3] to [:1] to execute one at a time
-                        if opp.expected_profit >= self.min_profit_usd:
-                            logger.info(f"Executing arbitrage for {opp.token.symbol}...")
-                            tasks.append(self.execute_arbitrage(opp))
-                    
-                    if tasks:
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-                        
-                        for result in results:
-                            if isinstance(result, Exception):
-                                logger.error(f"Execution error: {result}")
-                            elif isinstance(result, TradeResult) and result.success:
-                                # If we successfully executed a trade, skip remaining opportunities
-                                # to avoid overexposure
-                                logger.info("Successfully executed trade, skipping remaining opportunities")
-                else:
-                    # Log token prices periodically
-                    if checks_count % 10 == 0:  # Every 10 checks
-                        logger.info("No opportunities found. Current token prices:")
-                        for token in self.tokens[:3]:  # Show first 3 tokens
-                            jupiter_data = await self.get_jupiter_price(token)
-                            raydium_data = await self.get_raydium_price(token)
-                            
-                            if jupiter_data and raydium_data:
-                                j_price, _ = jupiter_data
-                                r_price, _ = raydium_data
-                                diff_pct = abs(j_price - r_price) / min(j_price, r_price) * 100
-                                logger.info(f"  {token.symbol}: Jupiter=${j_price:.8f}, Raydium=${r_price:.8f}, Diff={diff_pct:.2f}%")
-                
-                consecutive_errors = 0
-                
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"Monitor loop error: {e}")
-                
-                if consecutive_errors > 5:
-                    logger.error("Too many consecutive errors, pausing...")
-                    await asyncio.sleep(30)
-                    consecutive_errors = 0
-            
-            # Dynamic sleep based on market activity
-            sleep_time = self.config.get('check_interval', 5)
-            if len(opportunities) == 0:
-                sleep_time = min(sleep_time * 1.5, 30)  # Slow down gradually if no opportunities
-            
-            logger.debug(f"Sleeping for {sleep_time} seconds...")
-            await asyncio.sleep(sleep_time)
-
-    async def start(self):
-        """Start the bot"""
-        self.running = True
-
-        # Initialize Jito client if enabled
-        if self.jito_client:
-            await self.jito_client.__aenter__()
-        
-        # Start prometheus metrics server - with error handling
-        try:
-            # Try different ports if 8000 is taken
-            ports_to_try = [8000, 8001, 8002, 8003, 9090]
-            metrics_started = False
-            
-            for port in ports_to_try:
-                try:
-                    prometheus_client.start_http_server(port)
-                    logger.info(f"Metrics server started on port {port}")
-                    metrics_started = True
-                    break
-                except OSError as e:
-                    if "Address already in use" in str(e) or "access a socket" in str(e):
-                        logger.warning(f"Port {port} is already in use, trying next port...")
-                        continue
-                    else:
-                        raise
-            
-            if not metrics_started:
-                logger.warning("Could not start metrics server - all ports in use. Continuing without metrics.")
-        except Exception as e:
-            logger.warning(f"Failed to start metrics server: {e}. Continuing without metrics.")
-        
-        # Create tasks
-        tasks = [
-            asyncio.create_task(self.monitor_loop()),
-            asyncio.create_task(self.health_check())
-        ]
-        
-        # Handle shutdown
-        def signal_handler(sig, frame):
-            logger.info("Shutdown signal received")
-            self.running = False
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
-        try:
-            await asyncio.gather(*tasks)
-        except Exception as e:
-            logger.error(f"Bot error: {e}")
-        finally:
-            self.running = False
-            await self.client.close()
-            if self.jito_client:
-                await self.jito_client.__aexit__(None, None, None)
-            self.executor.shutdown()
-            logger.info("Bot stopped")
-
-async def main():
-    """Main entry point"""
-    # Check for required files
-    if not os.path.exists('config/config.json'):
-        print("Creating default config.json...")
-        os.makedirs('config', exist_ok=True)
-        default_config = {
-            "rpc_endpoint": "https://api.mainnet-beta.solana.com",
-            "wallet_path": "wallet.json",
-            "usdc_mint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-            "min_profit_usd": 10.0,
-            "max_position_size": 5000.0,
-            "max_price_impact": 0.01,
-            "min_price_difference": 0.007,  # 0.7% minimum price difference
-            "priority_fee_microlamports": 10000,
-            "max_daily_loss": 100.0,
-            "check_interval": 5,
-            "use_jito_bundles": False,  # Disabled by default
-            "tokens": {
-                "BONK": {
-                    "mint": "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
-                    "decimals": 5,
-                    "min_liquidity": 50000
-                },
-                "WIF": {
-                    "mint": "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm",
-                    "decimals": 6,
-                    "min_liquidity": 100000
-                },
-                "JUP": {
-                    "mint": "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN",
-                    "decimals": 6,
-                    "min_liquidity": 100000
-                }
-            }
-        }
-        
-        with open('config/config.json', 'w') as f:
-            json.dump(default_config, f, indent=2)
-        
-        print("Please configure config/config.json and add your wallet")
-        return
-    
-    # Create necessary directories
-    os.makedirs('logs', exist_ok=True)
-    os.makedirs('data', exist_ok=True)
-    
-    # Start bot
-    bot = ProductionArbitrageBot()
-    await bot.start()
-
-if __name__ == "__main__":
-    print("=" * 60)
-    print("PRODUCTION SOLANA ARBITRAGE BOT v2.0")
-    print("=" * 60)
+"""
+Production-Ready Solana Arbitrage Bot
+Author: Solana Arbitrage System
+Version: 2.0.0
+"""
+
+import asyncio
+import aiohttp
+import bisect
+import heapq
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Any
+from enum import Enum
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import signal
+import sys
+
+# Solana imports
+from solana.rpc import types
+from solana.rpc.async_api import AsyncClient
+from solana.transaction import Transaction
+from solana.rpc.commitment import Confirmed, Finalized
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+from solders.message import MessageV0
+from solders.instruction import Instruction, AccountMeta
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from spl.token.instructions import get_associated_token_address
+import base58
+import base64
+import binascii
+
+# Websocket signature subscriptions - push-based confirmation beats polling
+try:
+    from solana.rpc.websocket_api import connect as ws_connect
+except ImportError:
+    ws_connect = None
+
+# HTTP/2 client for Jupiter - multiplexes concurrent quote requests over
+# one TLS connection instead of one socket per in-flight request. Needs
+# httpx with the h2 extra; the aiohttp session remains the fallback.
+try:
+    import httpx
+    _HTTP2_AVAILABLE = True
+    try:
+        import h2  # noqa: F401 - httpx(http2=True) requires it
+    except ImportError:
+        _HTTP2_AVAILABLE = False
+except ImportError:
+    httpx = None
+    _HTTP2_AVAILABLE = False
+
+# Database
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+
+# Monitoring
+import prometheus_client
+from prometheus_client import Counter, Histogram, Gauge
+
+# Import Jito client - Fixed import
+try:
+    from modules.jito_client import JitoClient, JitoConfig
+except ImportError:
+    # If running from src directory
+    try:
+        from .modules.jito_client import JitoClient, JitoConfig
+    except ImportError:
+        # Jito not available - will run without it
+        JitoClient = None
+        JitoConfig = None
+
+# Fast JSON - orjson parses multi-KB quote payloads several times faster
+# than the stdlib; fall back to json when it isn't installed
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def json_dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def json_dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# Setup structured logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('logs/arbitrage_bot.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Metrics
+trade_counter = Counter('arbitrage_trades_total', 'Total number of arbitrage trades')
+profit_histogram = Histogram('arbitrage_profit_usd', 'Profit distribution in USD')
+opportunity_gauge = Gauge('arbitrage_opportunities_active', 'Current number of active opportunities')
+balance_gauge = Gauge('wallet_balance_usd', 'Current wallet balance in USD')
+
+# Fee model constants, hoisted so the size loop doesn't rebuild them
+SWAP_FEE_RATE = 0.0025 * 2  # 0.25% each way on Jupiter routes = 0.5% total
+GAS_FEES_USD = 0.00003 * 150  # 0.00003 SOL x $150 = $0.0045 per transaction
+MIN_PROFIT_MARGIN_PCT = 1.0  # Minimum profit as a percentage of size
+
+# Trade-size ladders per balance band, built once as sorted floats so the
+# per-token loop can slice them instead of rebuilding a list each pass
+_LADDER_SMALL = (10.0, 15.0, 20.0, 25.0, 30.0, 40.0, 50.0)
+_LADDER_MEDIUM = (20.0, 50.0, 100.0, 150.0, 200.0, 300.0)
+_LADDER_LARGE = (50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0)
+
+# Memecoins whose Jupiter liquidity estimates run low get a floor instead
+_MIN_LIQUIDITY_FLOOR_SYMBOLS = frozenset(('BONK', 'WIF', 'POPCAT', 'MEME'))
+_MIN_LIQUIDITY_FLOOR_USD = 1000.0
+
+
+def _impact_for_size(size_usd: float) -> float:
+    """Impact model - pure function of trade size"""
+    # For small trades, use minimal impact
+    if size_usd <= 100:
+        return 0.0001  # 0.01% for small trades
+    elif size_usd <= 1000:
+        return 0.0005  # 0.05% for medium trades
+    else:
+        # Simplified model - in production, use actual DEX quotes
+        return 0.001 * (size_usd / 10000)  # 0.1% base
+
+
+# The model only depends on size and the ladders are fixed, so the
+# impact per rung is a table lookup at scan time - constant-folded here
+# instead of recomputed per token per cycle
+_LADDER_IMPACTS = {
+    ladder: tuple(_impact_for_size(s) for s in ladder)
+    for ladder in (_LADDER_SMALL, _LADDER_MEDIUM, _LADDER_LARGE)
+}
+
+# Swap fees are likewise linear in size, so fold them per rung too
+_LADDER_FEES = {
+    ladder: tuple(s * SWAP_FEE_RATE for s in ladder)
+    for ladder in (_LADDER_SMALL, _LADDER_MEDIUM, _LADDER_LARGE)
+}
+
+
+@lru_cache(maxsize=512)
+def _mint_pubkey(mint: str) -> Pubkey:
+    """Memoized Pubkey for a mint address - base58 decode once per mint"""
+    return Pubkey.from_string(mint)
+
+
+# Monotonic opportunity-id sequence; seeding with the boot time keeps ids
+# unique across restarts without a per-opportunity clock read
+_OPP_SEQ = itertools.count(time.time_ns())
+
+
+class DEX(Enum):
+    JUPITER = "jupiter"
+    RAYDIUM = "raydium"
+    ORCA = "orca"
+    METEORA = "meteora"
+
+@dataclass(slots=True)
+class Token:
+    symbol: str
+    mint: str
+    decimals: int
+    min_liquidity: float = 10000.0  # Minimum liquidity in USD
+    # Base-unit scale (10**decimals), derived once at construction so
+    # amount conversions never re-exponentiate
+    scale: int = 0
+
+    def __post_init__(self):
+        if not self.scale:
+            self.scale = 10 ** self.decimals
+
+@dataclass(slots=True)
+class ArbitrageOpportunity:
+    id: str
+    token: Token
+    buy_dex: DEX
+    sell_dex: DEX
+    buy_price: float
+    sell_price: float
+    size_usd: float
+    expected_profit: float
+    price_impact: float
+    timestamp: datetime
+    expires_at: datetime
+    # Monotonic nanosecond expiry for the hot execute path - immune to
+    # wall-clock jumps; the datetime fields above are kept for
+    # persistence and reporting
+    expires_ns: int = 0
+
+    def is_valid(self) -> bool:
+        if self.expires_ns:
+            return time.monotonic_ns() < self.expires_ns
+        return datetime.utcnow() < self.expires_at
+
+    def db_row(self) -> tuple:
+        """Row for the opportunities table"""
+        return (
+            self.id,
+            self.token.symbol,
+            self.token.mint,
+            self.buy_dex.value,
+            self.sell_dex.value,
+            self.buy_price,
+            self.sell_price,
+            self.size_usd,
+            self.expected_profit,
+            self.price_impact,
+            # Pre-rendered strings skip sqlite3's per-row datetime
+            # adapter (deprecated since 3.12 anyway); the space
+            # separator matches CURRENT_TIMESTAMP's format
+            self.timestamp.isoformat(sep=' '),
+            self.expires_at.isoformat(sep=' '),
+            False
+        )
+
+@dataclass(slots=True)
+class TradeResult:
+    opportunity_id: str
+    success: bool
+    buy_tx: Optional[str]
+    sell_tx: Optional[str]
+    actual_profit: Optional[float]
+    error: Optional[str]
+    gas_used: float
+    execution_time: float
+
+    def db_row(self, trade_id: str, opp: ArbitrageOpportunity) -> tuple:
+        """Row for the trades table"""
+        return (
+            trade_id,
+            self.opportunity_id,
+            opp.token.symbol,
+            opp.token.mint,
+            opp.buy_dex.value,
+            opp.sell_dex.value,
+            opp.buy_price,
+            opp.sell_price,
+            opp.size_usd,
+            opp.expected_profit,
+            self.actual_profit,
+            self.buy_tx,
+            self.sell_tx,
+            self.success,
+            self.error,
+            self.gas_used,
+            self.execution_time,
+            datetime.utcnow().isoformat(sep=' ')
+        )
+
+class RateLimiter:
+    """Advanced rate limiter with burst support
+
+    Deadline-scheduled: every acquire claims the next slot on a shared
+    timeline and sleeps exactly until it, so there is no lock, no
+    wake-and-recheck loop, and a gather() of N calls costs N slot
+    assignments instead of N contended wakeups. The schedule may trail
+    the clock by up to burst slots, which is the burst allowance.
+    """
+    def __init__(self, calls_per_second: int, burst: int = 5):
+        self.calls_per_second = calls_per_second
+        self.burst = burst
+        self.interval = 1.0 / calls_per_second
+        # Start far enough in the past that a fresh limiter absorbs a
+        # full burst without waiting
+        self._next = time.monotonic() - (burst - 1) * self.interval
+
+    async def acquire(self):
+        # asyncio is single-threaded, so the read-modify-write below is
+        # atomic between awaits. Monotonic time can't jump backwards
+        # under NTP adjustments the way time.time() can.
+        now = time.monotonic()
+        slot = max(self._next, now - (self.burst - 1) * self.interval)
+        self._next = slot + self.interval
+        if slot > now:
+            try:
+                await asyncio.sleep(slot - now)
+            except asyncio.CancelledError:
+                # Hedging and gather timeouts cancel waiters routinely;
+                # give the claimed slot back (slots are fungible) so
+                # dead claims don't delay live callers
+                self._next -= self.interval
+                raise
+
+class PriceCache:
+    """In-memory LRU price cache with TTL
+
+    Entries carry a monotonic-clock expiry (immune to wall-clock jumps)
+    and the cache is capped so long runs can't grow it unboundedly.
+    """
+    def __init__(self, ttl_seconds: int = 5, max_entries: int = 4096):
+        self.cache: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self.ttl = ttl_seconds
+        self.ttl_ns = int(ttl_seconds * 1_000_000_000)
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        value, expires_ns = entry
+        if time.monotonic_ns() < expires_ns:
+            self.cache.move_to_end(key)
+            return value
+        # Leave the stale entry in place: a later set() overwrites it
+        # and the periodic clear_expired()/LRU cap reclaim the rest,
+        # which is cheaper than a dict delete on every stale hit
+        return None
+
+    def get_fresh(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Like get(), but also rejects entries older than max_age seconds"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        value, expires_ns = entry
+        now = time.monotonic_ns()
+        if now >= expires_ns:
+            return None
+        if max_age is not None:
+            age_ns = self.ttl_ns - (expires_ns - now)
+            if age_ns > int(max_age * 1_000_000_000):
+                return None
+        self.cache.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self.cache[key] = (value, time.monotonic_ns() + self.ttl_ns)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def clear_expired(self):
+        now_ns = time.monotonic_ns()
+        expired_keys = [
+            key for key, (_, expires_ns) in self.cache.items()
+            if now_ns >= expires_ns
+        ]
+        for key in expired_keys:
+            del self.cache[key]
+
+# Small pools of reusable request dicts for the swap-builder hot path;
+# mutating a recycled dict avoids allocating short-lived dicts per trade
+_PARAM_POOL: deque = deque()
+_SWAP_POOL: deque = deque()
+
+def _pool_get(pool: deque) -> dict:
+    try:
+        return pool.pop()
+    except IndexError:
+        return {}
+
+def _pool_put(pool: deque, d: dict):
+    if len(pool) < 32:
+        d.clear()
+        pool.append(d)
+
+# Swap builds ride the shared quote session but get their own request
+# timeout: routing a swap can legitimately take longer than the 3 s
+# fail-fast budget price quotes run under, and an owned fallback
+# session would otherwise have no bound at all
+_SWAP_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+class TransactionBuilder:
+    """Build optimized transactions with priority fees"""
+
+    @staticmethod
+    async def build_jupiter_swap(
+        client: AsyncClient,
+        wallet: Keypair,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        slippage_bps: int = 50,
+        priority_fee: int = 10000,  # microlamports
+        session: Optional[aiohttp.ClientSession] = None,
+        user_pubkey_str: Optional[str] = None
+    ) -> Optional[VersionedTransaction]:
+        """Build Jupiter swap transaction with priority fees"""
+        # Use the caller's pooled session when provided so we reuse
+        # keep-alive connections instead of paying DNS/TCP/TLS per call
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        params = _pool_get(_PARAM_POOL)
+        swap_data = _pool_get(_SWAP_POOL)
+        try:
+            # Get quote
+            quote_url = "https://quote-api.jup.ag/v6/quote"
+            params.update(
+                inputMint=input_mint,
+                outputMint=output_mint,
+                amount=amount,
+                slippageBps=slippage_bps,
+                maxAccounts=64
+            )
+
+            async with session.get(
+                quote_url, params=params, timeout=_SWAP_HTTP_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    return None
+                quote = json_loads(await response.read())
+
+            # Get swap transaction
+            swap_url = "https://quote-api.jup.ag/v6/swap"
+            swap_data.update(
+                quoteResponse=quote,
+                # Callers pass the pre-rendered pubkey string; rendering
+                # base58 per build only happens on the cold path
+                userPublicKey=user_pubkey_str or str(wallet.pubkey()),
+                wrapAndUnwrapSol=True,
+                computeUnitPriceMicroLamports=priority_fee,
+                dynamicComputeUnitLimit=True
+            )
+
+            async with session.post(
+                swap_url,
+                data=json_dumps(swap_data),
+                headers={'Content-Type': 'application/json'},
+                timeout=_SWAP_HTTP_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    return None
+                swap_response = json_loads(await response.read())
+
+            # Deserialize transaction - a2b_base64 is the C fast path
+            # b64decode wraps, skipping its validation/translate pass
+            tx_data = binascii.a2b_base64(swap_response['swapTransaction'])
+            return VersionedTransaction.from_bytes(tx_data)
+
+        except Exception as e:
+            logger.error(f"Error building Jupiter swap: {e}")
+            return None
+        finally:
+            _pool_put(_PARAM_POOL, params)
+            _pool_put(_SWAP_POOL, swap_data)
+            if own_session:
+                await session.close()
+
+    @staticmethod
+    async def build_raydium_swap_via_jupiter(
+        client: AsyncClient,
+        wallet: Keypair,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        slippage_bps: int = 50,
+        priority_fee: int = 10000,
+        session: Optional[aiohttp.ClientSession] = None,
+        user_pubkey_str: Optional[str] = None
+    ) -> Optional[VersionedTransaction]:
+        """Build Raydium swap using Jupiter's routing (which includes Raydium)"""
+        # Jupiter will automatically route through Raydium if it's the best price
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        params = _pool_get(_PARAM_POOL)
+        swap_data = _pool_get(_SWAP_POOL)
+        try:
+            quote_url = "https://quote-api.jup.ag/v6/quote"
+            params.update(
+                inputMint=input_mint,
+                outputMint=output_mint,
+                amount=amount,
+                slippageBps=slippage_bps,
+                onlyDirectRoutes='true',  # Fixed: Changed from True to 'true'
+                maxAccounts=64
+            )
+
+            async with session.get(
+                quote_url, params=params, timeout=_SWAP_HTTP_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    return None
+                quote = json_loads(await response.read())
+
+            # Get swap transaction
+            swap_url = "https://quote-api.jup.ag/v6/swap"
+            swap_data.update(
+                quoteResponse=quote,
+                # Callers pass the pre-rendered pubkey string; rendering
+                # base58 per build only happens on the cold path
+                userPublicKey=user_pubkey_str or str(wallet.pubkey()),
+                wrapAndUnwrapSol=True,
+                computeUnitPriceMicroLamports=priority_fee,
+                dynamicComputeUnitLimit=True
+            )
+
+            async with session.post(
+                swap_url,
+                data=json_dumps(swap_data),
+                headers={'Content-Type': 'application/json'},
+                timeout=_SWAP_HTTP_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    return None
+                swap_response = json_loads(await response.read())
+
+            # Deserialize transaction - a2b_base64 is the C fast path
+            # b64decode wraps, skipping its validation/translate pass
+            tx_data = binascii.a2b_base64(swap_response['swapTransaction'])
+            return VersionedTransaction.from_bytes(tx_data)
+
+        except Exception as e:
+            logger.error(f"Error building Raydium swap via Jupiter: {e}")
+            return None
+        finally:
+            _pool_put(_PARAM_POOL, params)
+            _pool_put(_SWAP_POOL, swap_data)
+            if own_session:
+                await session.close()
+
+# SQL defined once so sqlite3's statement cache gets byte-identical
+# strings and never re-parses them after the first call
+_OPP_SQL = "INSERT OR REPLACE INTO opportunities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_TRADE_SQL = "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_MARK_EXECUTED_SQL = "UPDATE opportunities SET executed = TRUE WHERE id = ?"
+
+class ArbitrageDatabase:
+    """SQLite database for trade history and analytics"""
+
+    def __init__(self, db_path: str = "data/arbitrage.db"):
+        self.db_path = db_path
+        # One long-lived connection instead of connect/close per write.
+        # WAL mode lets readers proceed while we write, and
+        # synchronous=NORMAL avoids an fsync per commit.
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        # Memory-map the db file (256 MB cap) so reads skip the
+        # read() syscall, and wait out writer contention instead of
+        # surfacing SQLITE_BUSY to the flusher
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._lock = threading.Lock()
+        # Dedicated single writer thread: sqlite writes never compete
+        # with whatever else lands on the loop's default executor, and
+        # one thread means the connection is only ever written from it
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="db-writer"
+        )
+        # Writes are queued and flushed in batches so one transaction
+        # (one fsync) covers many rows instead of one commit per event.
+        self._write_q: asyncio.Queue = asyncio.Queue()
+        self._flusher_task: Optional[asyncio.Task] = None
+        # Prometheus objects take locks on every update; trades accumulate
+        # in plain Python state and a background task publishes them
+        self._pending_trades = 0
+        self._pending_profits: List[float] = []
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._init_db()
+
+    def close(self):
+        """Close the underlying connection"""
+        self._write_executor.shutdown()
+        with self._lock:
+            self._conn.close()
+
+    def _init_db(self):
+        """Initialize database tables"""
+        conn = self._conn
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trades (
+                id TEXT PRIMARY KEY,
+                opportunity_id TEXT,
+                token_symbol TEXT,
+                token_mint TEXT,
+                buy_dex TEXT,
+                sell_dex TEXT,
+                buy_price REAL,
+                sell_price REAL,
+                size_usd REAL,
+                expected_profit REAL,
+                actual_profit REAL,
+                buy_tx TEXT,
+                sell_tx TEXT,
+                success BOOLEAN,
+                error TEXT,
+                gas_used REAL,
+                execution_time REAL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS opportunities (
+                id TEXT PRIMARY KEY,
+                token_symbol TEXT,
+                token_mint TEXT,
+                buy_dex TEXT,
+                sell_dex TEXT,
+                buy_price REAL,
+                sell_price REAL,
+                size_usd REAL,
+                expected_profit REAL,
+                price_impact REAL,
+                discovered_at DATETIME,
+                expires_at DATETIME,
+                executed BOOLEAN DEFAULT FALSE
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_token ON trades(token_mint)
+        """)
+
+    async def save_opportunity(self, opp: ArbitrageOpportunity):
+        """Save discovered opportunity"""
+        self._write_q.put_nowait(("opportunity", opp.db_row()))
+        self._ensure_flusher()
+
+    async def save_opportunities_batch(self, opps: List[ArbitrageOpportunity]):
+        """Queue a whole scan's opportunities in one go"""
+        if not opps:
+            return
+        for opp in opps:
+            self._write_q.put_nowait(("opportunity", opp.db_row()))
+        self._ensure_flusher()
+
+    async def save_trade(self, opp: ArbitrageOpportunity, result: TradeResult):
+        """Save executed trade"""
+        trade_id = f"trade_{int(time.time() * 1000000)}"
+        self._write_q.put_nowait(("trade", result.db_row(trade_id, opp)))
+        # Mark opportunity as executed
+        self._write_q.put_nowait(("executed", (opp.id,)))
+        self._ensure_flusher()
+
+        # Metrics are published by the background task, not here
+        self._pending_trades += 1
+        if result.actual_profit:
+            self._pending_profits.append(float(result.actual_profit))
+
+    def _ensure_flusher(self):
+        """Start the background flusher and metrics publisher on first write"""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.get_running_loop().create_task(
+                self._db_flusher()
+            )
+        if self._metrics_task is None or self._metrics_task.done():
+            self._metrics_task = asyncio.get_running_loop().create_task(
+                self._metrics_publisher()
+            )
+
+    def _publish_metrics(self):
+        if self._pending_trades:
+            trade_counter.inc(self._pending_trades)
+            self._pending_trades = 0
+        if self._pending_profits:
+            profits, self._pending_profits = self._pending_profits, []
+            for profit in profits:
+                profit_histogram.observe(profit)
+
+    async def _metrics_publisher(self):
+        """Push accumulated trade metrics to prometheus every 500ms"""
+        while True:
+            await asyncio.sleep(0.5)
+            self._publish_metrics()
+
+    async def _db_flusher(self):
+        """Drain queued writes and commit them in batches"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_q.get()]
+            try:
+                # Give concurrent writers a moment to pile on
+                await asyncio.sleep(0.05)
+                while not self._write_q.empty() and len(batch) < 256:
+                    batch.append(self._write_q.get_nowait())
+            except asyncio.CancelledError:
+                # Shutdown cancelled us mid-collect: hand the popped rows
+                # back so the final flush() still commits them
+                for item in batch:
+                    self._write_q.put_nowait(item)
+                raise
+            try:
+                # Shield the commit: if cancellation lands here the
+                # writer thread still finishes the batch it was handed
+                await asyncio.shield(loop.run_in_executor(
+                    self._write_executor, self._flush_batch, batch
+                ))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Database flush error: {e}")
+
+    async def flush(self):
+        """Synchronously flush anything still queued (shutdown path)"""
+        loop = asyncio.get_running_loop()
+        while not self._write_q.empty():
+            batch = []
+            while not self._write_q.empty() and len(batch) < 256:
+                batch.append(self._write_q.get_nowait())
+            await loop.run_in_executor(
+                self._write_executor, self._flush_batch, batch
+            )
+        self._publish_metrics()
+
+    def _flush_batch(self, batch: List[Tuple[str, tuple]]):
+        opportunities = [row for kind, row in batch if kind == "opportunity"]
+        trades = [row for kind, row in batch if kind == "trade"]
+        executed = [row for kind, row in batch if kind == "executed"]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if opportunities:
+                    self._conn.executemany(_OPP_SQL, opportunities)
+                if trades:
+                    self._conn.executemany(_TRADE_SQL, trades)
+                if executed:
+                    self._conn.executemany(_MARK_EXECUTED_SQL, executed)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+class ProductionArbitrageBot:
+    """Production-ready arbitrage bot with all features"""
+    
+    def __init__(self, config_path: str = "config/config.json"):
+        """Initialize the production bot"""
+        # Load configuration
+        with open(config_path, 'r') as f:
+            self.config = json_loads(f.read())
+        
+        # Initialize components
+        self.wallet = self._load_wallet()
+        self.client = AsyncClient(
+            self.config['rpc_endpoint'],
+            commitment=Confirmed
+        )
+        
+        # Tokens to monitor
+        self.tokens = self._load_tokens()
+
+        # Parallel metadata views so hot paths don't recompute per call:
+        # the mint tuple feeds batch prefetches and 10**decimals is looked
+        # up per mint instead of re-exponentiating on every quote
+        self._token_mints = tuple(t.mint for t in self.tokens)
+        self._decimals_pow = {t.mint: t.scale for t in self.tokens}
+        self._token_opts = {
+            t.mint: types.TokenAccountOpts(mint=_mint_pubkey(t.mint))
+            for t in self.tokens
+        }
+        # Cache-key strings for the per-venue price caches; the getters
+        # run many times per scan cycle and these never change
+        self._jup_keys = {t.mint: f"jupiter_{t.mint}" for t in self.tokens}
+        self._ray_keys = {t.mint: f"raydium_{t.mint}" for t in self.tokens}
+        
+        # Rate limiters for each API
+        self.rate_limiters = {
+            DEX.JUPITER: RateLimiter(calls_per_second=10, burst=20),
+            DEX.RAYDIUM: RateLimiter(calls_per_second=5, burst=10),
+            "rpc": RateLimiter(calls_per_second=40, burst=50)
+        }
+
+        # Short-lived USDC balance memo shared by scan and execute paths
+        self._usdc_cache: Optional[Tuple[float, float]] = None
+
+        # In-flight price fetches keyed by cache key, so concurrent
+        # cache misses for one mint collapse into a single upstream call
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Balances pushed by the account-subscribe stream; None/False
+        # until the stream is up, at which point the cached getters stop
+        # hitting RPC entirely
+        self._sol_balance: Optional[float] = None
+        self._balance_stream_live = False
+
+        # Last scan's per-DEX prices, used to skip quiet tokens
+        self._last_prices: Dict[str, Dict[DEX, float]] = {}
+
+        # Bound concurrent price lookups per venue when fanning out scans
+        self._dex_semaphores = {
+            DEX.JUPITER: asyncio.Semaphore(20),
+            DEX.RAYDIUM: asyncio.Semaphore(10),
+            DEX.ORCA: asyncio.Semaphore(10),
+            DEX.METEORA: asyncio.Semaphore(10),
+        }
+
+        # Bound how many tokens are evaluated at once
+        self._scan_sem = asyncio.Semaphore(self.config.get('scan_concurrency', 8))
+
+        # Trade-size ladder for the current scan, re-picked per cycle
+        self._scan_ladder = _LADDER_LARGE
+
+        # Set by the price stream when a quote moves enough to matter,
+        # so the monitor loop can cut its idle sleep short
+        self._scan_wake = asyncio.Event()
+
+
+        # Price cache
+        self.price_cache = PriceCache(ttl_seconds=3)
+        
+        # Database
+        self.db = ArbitrageDatabase()
+        
+        # Trading parameters stay plain floats: ranking and comparison
+        # don't need exact decimal arithmetic, and float ops are far
+        # cheaper on the per-scan hot path
+        self.min_profit_usd = float(self.config.get('min_profit_usd', 10.0))
+        self.max_position_size = float(self.config.get('max_position_size', 5000.0))
+        self.max_price_impact = float(self.config.get('max_price_impact', 0.01))  # 1%
+        self.min_price_difference = float(self.config.get('min_price_difference', 0.007))  # 0.7% default
+        self.min_price_difference_pct = self.min_price_difference * 100
+        self.priority_fee = int(self.config.get('priority_fee_microlamports', 10000))
+
+        # TEMPORARY: Lower min profit for testing
+        if self.config.get('test_mode', True):
+            self.min_profit_usd = 0.001  # $0.001 minimum for testing
+            logger.warning("TEST MODE: Minimum profit set to $0.001")
+
+        # Risk management
+        self.max_daily_loss = float(self.config.get('max_daily_loss', 100.0))
+        self.daily_loss = 0.0
+        self.last_loss_reset = datetime.utcnow()
+        
+        # State
+        self.running = False
+        self.active_opportunities = {}
+        self.execution_lock = asyncio.Lock()
+        
+        # Parse frequently used keys once - Pubkey.from_string decodes
+        # base58 on every call, so derived objects are cached here
+        self.wallet_pubkey = self.wallet.pubkey()
+        # str(pubkey) re-encodes base58 each time; the swap builders need
+        # it on every quote, so render it once here
+        self.wallet_pubkey_str = str(self.wallet_pubkey)
+        self.usdc_mint_pubkey = Pubkey.from_string(self.config['usdc_mint'])
+        self.usdc_account_opts = types.TokenAccountOpts(mint=self.usdc_mint_pubkey)
+        # Signer in solders form, converted once instead of per trade
+        if hasattr(self.wallet, 'secret_key'):
+            self._signer_keypair = Keypair.from_bytes(self.wallet.secret_key)
+        else:
+            self._signer_keypair = self.wallet
+
+        # Shared HTTP session (created lazily so __init__ stays sync).
+        # One pooled session gives keep-alive reuse across all price
+        # fetches and swap builds instead of a TLS handshake per request.
+        self.http: Optional[aiohttp.ClientSession] = None
+
+        # Dedicated Jupiter client (lazy, HTTP/2 when httpx+h2 are
+        # installed): the quote endpoint is hit for every token on every
+        # scan, and multiplexing those over a single connection avoids
+        # per-request socket setup under burst load.
+        self.jup_http = None
+        
+        # Initialize Jito client if available
+        self.use_jito = self.config.get('use_jito_bundles', False) and JitoClient is not None
+        self.jito_client = None
+        
+        if self.use_jito:
+            try:
+                jito_config = JitoConfig()
+                self.jito_client = JitoClient(jito_config, self.client)
+                logger.info("Jito bundle support enabled")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Jito client: {e}")
+                self.use_jito = False
+                self.jito_client = None
+        
+        logger.info(f"Production bot initialized. Wallet: {self.wallet.pubkey()}")
+    
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self.http is None or self.http.closed:
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=128,
+                    limit_per_host=64,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                # Price quotes are useless after a few seconds; fail fast
+                # rather than holding a pooled connection on a stuck request
+                timeout=aiohttp.ClientTimeout(total=3)
+            )
+        return self.http
+
+    def _jup_session(self):
+        """Get the Jupiter HTTP/2 client, or None when httpx is absent"""
+        if httpx is None:
+            return None
+        if self.jup_http is None or self.jup_http.is_closed:
+            self.jup_http = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                base_url="https://quote-api.jup.ag",
+                timeout=5.0,
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=50
+                )
+            )
+        return self.jup_http
+
+    def _load_wallet(self) -> Keypair:
+        """Load wallet with proper security"""
+        wallet_path = self.config.get('wallet_path', 'wallet.json')
+        
+        # Try environment variable first (more secure)
+        if 'SOLANA_PRIVATE_KEY' in os.environ:
+            secret_key = base58.b58decode(os.environ['SOLANA_PRIVATE_KEY'])
+            return Keypair.from_bytes(secret_key)
+        
+        # Fall back to file
+        if os.path.exists(wallet_path):
+            with open(wallet_path, 'r') as f:
+                wallet_data = json_loads(f.read())
+                # Handle both array format and object format
+                if isinstance(wallet_data, list):
+                    # Direct array of bytes
+                    return Keypair.from_bytes(wallet_data)
+                elif 'secret_key_b64' in wallet_data:
+                    # Base64 copy written by newer create_wallet runs;
+                    # decodes at C speed vs the base58 loop
+                    return Keypair.from_bytes(
+                        base64.b64decode(wallet_data['secret_key_b64'])
+                    )
+                else:
+                    # Object with secret_key field
+                    secret_key = base58.b58decode(wallet_data['secret_key'])
+                    return Keypair.from_bytes(secret_key)
+        
+        raise ValueError("No wallet found. Set SOLANA_PRIVATE_KEY or create wallet.json")
+    
+    def _load_tokens(self) -> List[Token]:
+        """Load tokens from configuration"""
+        tokens = []
+        token_config = self.config.get('tokens', {})
+        
+        for symbol, info in token_config.items():
+            tokens.append(Token(
+                symbol=symbol,
+                mint=info['mint'],
+                decimals=info['decimals'],
+                min_liquidity=info.get('min_liquidity', 10000.0)
+            ))
+        
+        return tokens
+    
+    async def get_jupiter_price(
+        self,
+        token: Token,
+        max_age: Optional[float] = None
+    ) -> Optional[Tuple[float, float]]:
+        """Get token price and liquidity from Jupiter
+
+        The background price stream keeps the cache warm, so this is
+        normally a cache hit; REST is only the cold-start fallback.
+        Callers that need fresher data than the cache TTL (the pre-trade
+        re-verify) pass max_age to force a refetch of older entries.
+        """
+        cache_key = self._jup_keys.get(token.mint) or f"jupiter_{token.mint}"
+        cached = self.price_cache.get_fresh(cache_key, max_age)
+        if cached:
+            return cached
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_jupiter_price(token)
+        )
+
+    async def _single_flight(self, key: str, fetch):
+        """Merge concurrent fetches for one key into a single upstream call
+
+        The first caller on a cache miss does the fetch; any caller that
+        arrives while it is in flight awaits the same future instead of
+        issuing a duplicate request.
+        """
+        while True:
+            existing = self._inflight.get(key)
+            if existing is None:
+                break
+            try:
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise  # we were cancelled, not the leader
+                # The leader was cancelled out from under us (scan
+                # timeout); retry, becoming the new leader if needed
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # Routine under the scan timeout: cancel the future rather
+            # than setting CancelledError on it, so waiters retry instead
+            # of inheriting our cancellation and an unobserved exception
+            # doesn't sit on a waiterless future
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.cancelled():
+                future.set_exception(e)
+            raise
+        else:
+            if not future.cancelled():
+                future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _hedged(self, make_request, delay: float = 0.1):
+        """Tail-latency hedge: duplicate a slow request, first reply wins
+
+        make_request is a zero-argument coroutine factory. If the first
+        attempt hasn't answered after delay seconds a second one is
+        launched in parallel and the straggler is cancelled.
+        """
+        first = asyncio.create_task(make_request())
+        try:
+            return await asyncio.wait_for(asyncio.shield(first), delay)
+        except asyncio.TimeoutError:
+            pass
+
+        second = asyncio.create_task(make_request())
+        done, pending = await asyncio.wait(
+            {first, second}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        return done.pop().result()
+
+    async def _fetch_jupiter_price(self, token: Token) -> Optional[Tuple[float, float]]:
+        """Fetch a fresh Jupiter quote and refresh the cache"""
+        cache_key = self._jup_keys.get(token.mint) or f"jupiter_{token.mint}"
+
+        await self.rate_limiters[DEX.JUPITER].acquire()
+
+        try:
+            # Get price for 1 token worth in USD
+            amount = self._decimals_pow.get(token.mint) or token.scale
+
+            params = {
+                'inputMint': token.mint,
+                'outputMint': self.config['usdc_mint'],
+                'amount': amount,
+                'slippageBps': 50
+            }
+
+            jup = self._jup_session()
+            if jup is not None:
+                # HTTP/2 path: hedged duplicates share one multiplexed
+                # connection instead of racing for pool sockets
+                async def _request():
+                    response = await jup.get("/v6/quote", params=params)
+                    if response.status_code != 200:
+                        return None
+                    return response.content
+            else:
+                session = self._http_session()
+
+                async def _request():
+                    async with session.get(
+                        "https://quote-api.jup.ag/v6/quote",
+                        params=params,
+                        timeout=aiohttp.ClientTimeout(total=5)
+                    ) as response:
+                        if response.status != 200:
+                            return None
+                        return await response.read()
+
+            raw = await self._hedged(
+                _request, float(self.config.get('hedge_delay', 0.1))
+            )
+            if raw is None:
+                return None
+
+            data = json_loads(raw)
+            # Amounts stay integer base units until the final divide
+            price = int(data['outAmount']) / 10 ** 6  # USDC decimals
+
+            # Estimate available liquidity (simplified)
+            routes = data.get('routePlan', [])
+            total_liquidity = 100.0 * sum(
+                int(route.get('outAmount') or 0) for route in routes
+            )  # Rough estimate
+
+            result = (price, total_liquidity)
+            self.price_cache.set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Jupiter price error for {token.symbol}: {e}")
+            return None
+
+    async def _jupiter_price_stream(self):
+        """Keep Jupiter prices flowing into the cache from the background
+
+        Jupiter exposes no public quote WebSocket, so the closest thing to
+        a subscription is one long-lived task refreshing every monitored
+        mint over the shared keep-alive connection just before the cache
+        TTL lapses. Scan-time get_jupiter_price calls then resolve from
+        the cache instead of paying an HTTPS round-trip each cycle.
+        """
+        interval = max(self.price_cache.ttl - 1, 1)
+        previous: Dict[str, float] = {}
+        while self.running:
+            try:
+                results = await asyncio.gather(
+                    *(self._fetch_jupiter_price(token) for token in self.tokens),
+                    return_exceptions=True
+                )
+                # Wake the monitor loop early when any quote moved by more
+                # than the arb threshold since the last refresh
+                for token, data in zip(self.tokens, results):
+                    if isinstance(data, BaseException) or not data:
+                        continue
+                    price = data[0]
+                    prev = previous.get(token.mint)
+                    if prev and abs(price - prev) >= self.min_price_difference * prev:
+                        self._scan_wake.set()
+                    previous[token.mint] = price
+            except Exception as e:
+                logger.error(f"Jupiter price stream error: {e}")
+            await asyncio.sleep(interval)
+
+    async def _fetch_dexscreener(self, mints: List[str]) -> Dict[str, List[dict]]:
+        """Fetch DexScreener pairs for many mints at once
+
+        DexScreener accepts up to 30 comma-separated mints per request, so
+        one scan cycle needs a single HTTP round-trip instead of one call
+        per token per DEX. Results are cached per mint so the per-DEX price
+        methods become in-process filters.
+        """
+        results: Dict[str, List[dict]] = {mint: [] for mint in mints}
+        session = self._http_session()
+        headers = {'User-Agent': 'ArbitrageBot/2.0'}
+
+        for i in range(0, len(mints), 30):
+            batch = mints[i:i + 30]
+            await self.rate_limiters[DEX.RAYDIUM].acquire()
+
+            try:
+                async with session.get(
+                    f"https://api.dexscreener.com/latest/dex/tokens/{','.join(batch)}",
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=5)
+                ) as response:
+                    if response.status != 200:
+                        continue
+
+                    data = json_loads(await response.read())
+                    for pair in data.get('pairs') or []:
+                        mint = pair.get('baseToken', {}).get('address')
+                        if mint in results:
+                            results[mint].append(pair)
+
+            except Exception as e:
+                logger.error(f"DexScreener batch fetch error: {e}")
+
+        for mint, pairs in results.items():
+            self.price_cache.set(f"dexscreener_{mint}", pairs)
+
+        return results
+
+    async def _get_dexscreener_pairs(self, token: Token) -> List[dict]:
+        """Get DexScreener pairs for one token, using the shared cache"""
+        cached = self.price_cache.get(f"dexscreener_{token.mint}")
+        if cached is not None:
+            return cached
+
+        results = await self._fetch_dexscreener([token.mint])
+        return results.get(token.mint, [])
+
+    def _best_dex_pair(
+        self,
+        pairs: List[dict],
+        dex_id: str,
+        token: Token
+    ) -> Optional[Tuple[float, float]]:
+        """Pick the deepest USDC/USDT pair for one DEX from DexScreener pairs"""
+        # Group once per token per cache window instead of re-scanning the
+        # full pair list (filter + max) for each of the three DEX methods
+        grouped = self.price_cache.get(f"dexbest_{token.mint}")
+        if grouped is None:
+            grouped = self._best_per_dex(pairs)
+            self.price_cache.set(f"dexbest_{token.mint}", grouped)
+
+        entry = grouped.get(dex_id)
+        if not entry:
+            return None
+
+        liquidity, best_pair = entry
+        price = float(best_pair.get('priceUsd') or 0)
+
+        if price > 0 and liquidity > token.min_liquidity:
+            return (price, liquidity)
+
+        return None
+
+    @staticmethod
+    def _best_per_dex(
+        pairs: List[dict],
+        quotes: frozenset = frozenset({'USDC', 'USDT'})
+    ) -> Dict[str, Tuple[float, dict]]:
+        """Single sweep over DexScreener pairs: deepest stable-quote pair per DEX"""
+        best: Dict[str, Tuple[float, dict]] = {}
+        for p in pairs:
+            quote = p.get('quoteToken') or {}
+            if quote.get('symbol') not in quotes:
+                continue
+            dex = p.get('dexId')
+            liquidity = float((p.get('liquidity') or {}).get('usd') or 0)
+            current = best.get(dex)
+            if current is None or liquidity > current[0]:
+                best[dex] = (liquidity, p)
+        return best
+
+    async def get_raydium_price(
+        self,
+        token: Token,
+        max_age: Optional[float] = None
+    ) -> Optional[Tuple[float, float]]:
+        """Get token price and liquidity from Raydium via DexScreener"""
+        cache_key = self._ray_keys.get(token.mint) or f"raydium_{token.mint}"
+        cached = self.price_cache.get_fresh(cache_key, max_age)
+        if cached:
+            return cached
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_raydium_price(token)
+        )
+
+    async def _fetch_raydium_price(self, token: Token) -> Optional[Tuple[float, float]]:
+        """Fetch a fresh Raydium price via DexScreener and refresh the cache"""
+        try:
+            pairs = await self._get_dexscreener_pairs(token)
+            result = self._best_dex_pair(pairs, 'raydium', token)
+
+            if result:
+                self.price_cache.set(
+                    self._ray_keys.get(token.mint) or f"raydium_{token.mint}",
+                    result
+                )
+            return result
+
+        except Exception as e:
+            logger.error(f"Raydium price error for {token.symbol}: {e}")
+            return None
+    
+    @staticmethod
+    def _price_impact(size_usd: float) -> float:
+        """Pure-math impact model shared by the async wrapper and the scan"""
+        return _impact_for_size(size_usd)
+
+    async def calculate_price_impact(
+        self,
+        token: Token,
+        dex: DEX,
+        size_usd: float
+    ) -> float:
+        """Estimate price impact for a given trade size"""
+        return self._price_impact(size_usd)
+    
+    async def get_usdc_balance(self) -> float:
+        """Get USDC balance for the wallet"""
+        try:
+            response = await self.client.get_token_accounts_by_owner_json_parsed(
+                self.wallet_pubkey,
+                self.usdc_account_opts
+            )
+
+            if response.value:
+                for account in response.value:
+                    try:
+                        parsed_info = account.account.data.parsed['info']
+                        balance = parsed_info['tokenAmount']['uiAmount']
+                        if balance and balance > 0:
+                            return float(balance)
+                    except Exception as e:
+                        logger.error(f"Error parsing token account: {e}")
+            return 0.0
+        except Exception as e:
+            logger.error(f"Error getting USDC balance: {e}")
+            return 0.0
+
+    async def get_usdc_balance_cached(self, ttl: float = 0.5) -> float:
+        """USDC balance with a short memo
+
+        The scan loop and execute_arbitrage both want the balance within
+        the same cycle; one RPC per ttl window serves them all. While the
+        account-subscribe stream is live the memo is push-updated on
+        every change, so it never goes stale and the ttl is moot.
+        """
+        if self._balance_stream_live and self._usdc_cache is not None:
+            return self._usdc_cache[0]
+        if self._usdc_cache is not None:
+            value, ts = self._usdc_cache
+            if time.monotonic() - ts < ttl:
+                return value
+
+        value = await self.get_usdc_balance()
+        self._usdc_cache = (value, time.monotonic())
+        return value
+
+    async def get_prices_batch(
+        self, tokens: List[Token]
+    ) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """Jupiter and Raydium prices for many tokens in one round
+
+        One gather issues every lookup concurrently, so wall time is a
+        single round-trip regardless of token count instead of two
+        sequential awaits per token.
+        """
+        # Warm the DexScreener cache in one multi-mint request first,
+        # so the Raydium lookups below are in-process filters instead
+        # of one HTTP call per cold mint
+        cold = [t.mint for t in tokens
+                if self.price_cache.get(f"dexscreener_{t.mint}") is None]
+        if cold:
+            await self._fetch_dexscreener(cold)
+
+        results = await asyncio.gather(
+            *(self.get_jupiter_price(t) for t in tokens),
+            *(self.get_raydium_price(t) for t in tokens),
+            return_exceptions=True
+        )
+        n = len(tokens)
+        prices: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        for i, token in enumerate(tokens):
+            jup, ray = results[i], results[n + i]
+            if isinstance(jup, BaseException):
+                jup = None
+            if isinstance(ray, BaseException):
+                ray = None
+            prices[token.mint] = (jup[0] if jup else None, ray[0] if ray else None)
+        return prices
+
+    def _ws_endpoint(self) -> str:
+        """Websocket form of the configured RPC endpoint"""
+        return (self.config['rpc_endpoint']
+                .replace('https://', 'wss://')
+                .replace('http://', 'ws://'))
+
+    async def _balance_stream(self):
+        """Keep SOL and USDC balances fresh from push notifications
+
+        One accountSubscribe each for the wallet and its USDC ATA
+        replaces the per-cycle balance polling: every notification
+        updates the same memo the cached getters read, so balance checks
+        become attribute reads while the stream is live.
+        """
+        if ws_connect is None:
+            return
+        usdc_ata = get_associated_token_address(self.wallet_pubkey, self.usdc_mint_pubkey)
+        while self.running:
+            try:
+                async with ws_connect(self._ws_endpoint()) as ws:
+                    await ws.account_subscribe(self.wallet_pubkey, commitment="confirmed",
+                                               encoding="base64")
+                    await ws.account_subscribe(usdc_ata, commitment="confirmed",
+                                               encoding="base64")
+                    self._balance_stream_live = True
+                    while self.running:
+                        try:
+                            # Bounded wait: notifications only arrive when
+                            # a balance changes, so an unbounded recv()
+                            # would pin shutdown until the next trade
+                            msgs = await asyncio.wait_for(ws.recv(), timeout=5)
+                        except asyncio.TimeoutError:
+                            continue  # re-check self.running
+                        for msg in msgs:
+                            value = getattr(getattr(msg, 'result', None), 'value', None)
+                            if value is None:
+                                continue  # subscription ack frame
+                            data = bytes(value.data)
+                            if len(data) == 165:
+                                # SPL token account layout: amount is the
+                                # u64 at offset 64
+                                amount = int.from_bytes(data[64:72], 'little')
+                                self._usdc_cache = (amount / 1e6, time.monotonic())
+                            else:
+                                self._sol_balance = value.lamports / 1e9
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Balance stream error ({e}); reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                self._balance_stream_live = False
+
+    async def _get_token_balance_raw(self, mint: str) -> int:
+        """Raw SPL balance of the wallet's associated token account
+
+        The ATA address is deterministic, so a single getAccountInfo on it
+        replaces the node-side json-parsed scan of every token account;
+        the amount is the little-endian u64 at offset 64 of the SPL
+        account layout.
+        """
+        ata = get_associated_token_address(self.wallet_pubkey, _mint_pubkey(mint))
+        await self.rate_limiters["rpc"].acquire()
+        info = await self.client.get_account_info(ata)
+        if info.value is None:
+            return 0
+        return int.from_bytes(bytes(info.value.data)[64:72], 'little')
+
+    async def _await_signature(self, signature, timeout: float = 15.0,
+                               label: str = "Transaction") -> None:
+        """Wait for a signature to reach confirmed status
+
+        Subscribes over websocket so the notification arrives as soon as the
+        RPC node sees the confirmation, instead of on a polling interval.
+        Falls back to get_signature_statuses polling if the websocket is
+        unavailable. Raises if the transaction itself failed; a plain
+        timeout is logged but not fatal (matching the old polling loop).
+        """
+        confirmed = False
+        tx_err = None
+
+        if ws_connect is not None:
+            try:
+                async with ws_connect(self._ws_endpoint()) as ws:
+                    await ws.signature_subscribe(signature, commitment="confirmed")
+                    # A tx that confirmed before the subscription
+                    # registered never produces a notification; check the
+                    # status once before blocking on the socket
+                    try:
+                        status = await self.client.get_signature_statuses([signature])
+                        info = status.value[0]
+                        if info is not None:
+                            tx_err = info.err
+                            confirmed = (
+                                tx_err is None and
+                                info.confirmation_status in ["confirmed", "finalized"]
+                            )
+                    except Exception:
+                        pass  # status check is best-effort; the socket decides
+                    deadline = time.monotonic() + timeout
+                    while not confirmed and tx_err is None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            logger.warning(f"{label} websocket confirmation timed out; falling back to polling")
+                            break
+                        for msg in await asyncio.wait_for(ws.recv(), timeout=remaining):
+                            value = getattr(getattr(msg, 'result', None), 'value', None)
+                            if value is None:
+                                continue  # subscription ack frame
+                            tx_err = getattr(value, 'err', None)
+                            confirmed = tx_err is None
+                            break
+            except asyncio.TimeoutError:
+                logger.warning(f"{label} websocket confirmation timed out; falling back to polling")
+            except Exception as e:
+                logger.warning(f"Websocket confirmation unavailable ({e}); polling instead")
+                confirmed = False
+                tx_err = None
+
+        if tx_err is not None:
+            raise Exception(f"{label} failed: {tx_err}")
+        if confirmed:
+            logger.info(f"{label} confirmed via websocket")
+            return
+
+        # Polling fallback for nodes without websocket support
+        max_retries = max(1, int(timeout / 0.5))
+        for i in range(max_retries):
+            await asyncio.sleep(0.5)
+            try:
+                status = await self.client.get_signature_statuses([signature])
+                info = status.value[0]
+            except Exception as e:
+                if i == max_retries - 1:
+                    logger.warning(f"{label} confirmation timeout: {e}")
+                continue
+            if info is not None:
+                if info.err:
+                    raise Exception(f"{label} failed: {info.err}")
+                if info.confirmation_status in ["confirmed", "finalized"]:
+                    logger.info(f"{label} confirmed after {(i + 1) * 0.5} seconds")
+                    return
+    
+    async def get_orca_price(self, token: Token) -> Optional[Tuple[float, float]]:
+        """Get token price from Orca via DexScreener"""
+        cache_key = f"orca_{token.mint}"
+        cached = self.price_cache.get(cache_key)
+        if cached:
+            return cached
+        
+        try:
+            pairs = await self._get_dexscreener_pairs(token)
+            result = self._best_dex_pair(pairs, 'orca', token)
+
+            if result:
+                self.price_cache.set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Orca price error for {token.symbol}: {e}")
+            return None
+    
+    async def get_meteora_price(self, token: Token) -> Optional[Tuple[float, float]]:
+        """Get token price from Meteora via DexScreener"""
+        cache_key = f"meteora_{token.mint}"
+        cached = self.price_cache.get(cache_key)
+        if cached:
+            return cached
+        
+        try:
+            pairs = await self._get_dexscreener_pairs(token)
+            result = self._best_dex_pair(pairs, 'meteora', token)
+
+            if result:
+                self.price_cache.set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Meteora price error for {token.symbol}: {e}")
+            return None
+
+    async def find_arbitrage_opportunities(self) -> List[ArbitrageOpportunity]:
+        """Find all profitable arbitrage opportunities"""
+        opportunities = []
+        
+        # Get current USDC balance to limit position sizes
+        usdc_balance = await self.get_usdc_balance_cached()
+        logger.debug(f"Current USDC balance: ${usdc_balance:.2f}")
+
+        # Pick the trade-size ladder once per scan; the balance is fixed
+        # for the cycle, so per-token re-selection was pure overhead
+        if usdc_balance < 100:
+            self._scan_ladder = _LADDER_SMALL
+        elif usdc_balance < 500:
+            self._scan_ladder = _LADDER_MEDIUM
+        else:
+            self._scan_ladder = _LADDER_LARGE
+
+        # Prune quiet tokens before spending HTTP on them: when last
+        # scan's snapshot showed the best spread below the threshold, sit
+        # this cycle out. The snapshot is consumed on skip, so a token is
+        # never skipped two cycles in a row.
+        active_tokens = []
+        for token in self.tokens:
+            snapshot = self._last_prices.pop(token.mint, None)
+            if snapshot and len(snapshot) >= 2:
+                low = min(snapshot.values())
+                if max(snapshot.values()) - low < self.min_price_difference * low:
+                    logger.debug(f"{token.symbol}: spread quiet last scan, skipping this cycle")
+                    continue
+            active_tokens.append(token)
+
+        # One batched DexScreener request warms the pair cache for every
+        # token, so the per-DEX price methods below don't hit the network
+        try:
+            await self._fetch_dexscreener([t.mint for t in active_tokens])
+        except Exception as e:
+            logger.error(f"DexScreener prefetch error: {e}")
+
+        # Fan out every (token, dex) lookup concurrently instead of
+        # serializing round trips; semaphores keep each venue in bounds
+        fetchers = [
+            (DEX.JUPITER, self.get_jupiter_price),
+            (DEX.RAYDIUM, self.get_raydium_price),
+            (DEX.ORCA, self.get_orca_price),
+            (DEX.METEORA, self.get_meteora_price),
+        ]
+
+        async def fetch_price(dex, fetcher, token):
+            try:
+                async with self._dex_semaphores[dex]:
+                    return await fetcher(token)
+            except Exception as e:
+                logger.debug(f"{token.symbol}: {dex.value} price error: {e}")
+                return None
+
+        # Cap the whole gather step: one slow venue shouldn't stall the
+        # scan for its full 5s client timeout. On timeout the pending
+        # lookups are cancelled and the cycle runs on partial results.
+        gather_timeout = self.config.get('price_gather_timeout', 0.8)
+        fetch_tasks: List[Tuple[Token, DEX, asyncio.Task]] = []
+        try:
+            async with asyncio.timeout(gather_timeout):
+                async with asyncio.TaskGroup() as tg:
+                    for token in active_tokens:
+                        for dex, fetcher in fetchers:
+                            fetch_tasks.append(
+                                (token, dex, tg.create_task(fetch_price(dex, fetcher, token)))
+                            )
+        except TimeoutError:
+            logger.warning(f"Price gather exceeded {gather_timeout}s; using partial results")
+
+        price_data: Dict[str, List[Tuple[DEX, float, float]]] = {t.mint: [] for t in active_tokens}
+        for token, dex, task in fetch_tasks:
+            if task.done() and not task.cancelled():
+                data = task.result()
+                if data:
+                    price_data[token.mint].append((dex, data[0], data[1]))
+
+        # Record this scan's snapshot for next cycle's pruning pass
+        for token in active_tokens:
+            self._last_prices[token.mint] = {
+                dex: price for dex, price, _ in price_data[token.mint]
+            }
+
+        # Evaluate tokens concurrently, bounded by the scan semaphore;
+        # DB writes happen after the gather so they stay in scan order
+        scan_results = await asyncio.gather(
+            *(self._scan_token(token, usdc_balance, price_data[token.mint])
+              for token in active_tokens),
+            return_exceptions=True
+        )
+
+        for token, result in zip(active_tokens, scan_results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error finding opportunities for {token.symbol}: {result}")
+                continue
+            opportunities.extend(result)
+
+        await self.db.save_opportunities_batch(opportunities)
+
+        # Update metrics
+        opportunity_gauge.set(len(opportunities))
+
+        if opportunities:
+            logger.info(f"Found {len(opportunities)} total opportunities")
+
+        return opportunities
+
+    async def _scan_token(
+        self,
+        token: Token,
+        usdc_balance: float,
+        all_prices: List[Tuple[DEX, float, float]]
+    ) -> List[ArbitrageOpportunity]:
+        """Evaluate one token's prices and return the opportunities found"""
+        async with self._scan_sem:
+            try:
+                # Need at least 2 DEXs to arbitrage
+                if len(all_prices) < 2:
+                    logger.debug(f"{token.symbol}: Not enough DEX prices ({len(all_prices)} DEXs)")
+                    return []
+
+                # The widest spread is always between the cheapest and the
+                # most expensive venue, so two O(N) reductions replace the
+                # old O(N^2) pairwise comparison loop
+                buy_dex, buy_price, buy_liquidity = min(all_prices, key=lambda p: p[1])
+                sell_dex, sell_price, sell_liquidity = max(all_prices, key=lambda p: p[1])
+
+                price_diff_pct = (sell_price - buy_price) / buy_price * 100
+
+                if price_diff_pct < self.min_price_difference_pct:
+                    logger.debug(f"{token.symbol}: No profitable DEX pairs found")
+                    return []
+
+                available_liquidity = min(buy_liquidity, sell_liquidity)
+
+                logger.info(f"{token.symbol}: Buy on {buy_dex.value} at ${buy_price:.8f}, Sell on {sell_dex.value} at ${sell_price:.8f} ({price_diff_pct:.2f}%)")
+                
+                # Calculate optimal position size
+                max_size_by_balance = usdc_balance * 0.5  # Use max 50% of balance to avoid getting stuck
+                max_size_by_config = self.max_position_size
+                max_size_by_liquidity = available_liquidity * 0.1  # Use max 10% of liquidity
+
+                # For tokens with low liquidity estimates from Jupiter, use a minimum
+                if token.symbol in _MIN_LIQUIDITY_FLOOR_SYMBOLS:
+                    max_size_by_liquidity = max(max_size_by_liquidity, _MIN_LIQUIDITY_FLOOR_USD)
+                
+                max_size = min(max_size_by_balance, max_size_by_config, max_size_by_liquidity)
+                
+                logger.info(f"{token.symbol}: Max size - Balance: ${max_size_by_balance:.2f}, Config: ${max_size_by_config:.2f}, Liquidity: ${max_size_by_liquidity:.2f} -> Using: ${max_size:.2f}")
+                
+                # Ladder chosen once per scan; the sizes are sorted so a
+                # bisect slice caps them to max_size without a filter pass
+                ladder = self._scan_ladder
+                sizes = ladder[:bisect.bisect_right(ladder, max_size)]
+                if len(sizes) < len(ladder):
+                    logger.debug(f"{token.symbol}: Sizes above ${max_size:.2f} skipped")
+                if not sizes:
+                    return []
+
+                # Closed-form prune: even at zero price impact the spread
+                # must cover swap fees, gas (cheapest at the largest size)
+                # and the required margin - skip the impact estimates when
+                # it can't possibly clear that bar
+                required_spread_pct = (
+                    (SWAP_FEE_RATE + GAS_FEES_USD / sizes[-1]) * 100
+                    + MIN_PROFIT_MARGIN_PCT
+                )
+                if price_diff_pct <= required_spread_pct:
+                    logger.debug(
+                        f"{token.symbol}: Spread {price_diff_pct:.3f}% below "
+                        f"breakeven {required_spread_pct:.3f}%"
+                    )
+                    return []
+
+                # Impacts and swap fees come from the precomputed ladder
+                # tables; the sizes slice is a prefix of the ladder, so
+                # the table prefixes line up with it column-for-column
+                buy_impacts = _LADDER_IMPACTS[ladder][:len(sizes)]
+                sell_impacts = buy_impacts
+                ladder_fees = _LADDER_FEES[ladder][:len(sizes)]
+
+                # Calculate expected profit for different sizes.
+                # Thresholds go into locals once; the ladder loop then
+                # runs on plain float compares without attribute lookups
+                max_price_impact = self.max_price_impact
+                min_profit_usd = self.min_profit_usd
+                for size_usd, buy_impact, sell_impact, swap_fees in zip(sizes, buy_impacts, sell_impacts, ladder_fees):
+                    total_impact = buy_impact + sell_impact
+
+                    # Skip if impact too high
+                    if total_impact > max_price_impact:
+                        logger.debug(f"{token.symbol}: Price impact too high ({total_impact:.4f} > {max_price_impact})")
+                        continue
+                    
+                    # Calculate profit
+                    effective_buy_price = buy_price * (1 + buy_impact)
+                    effective_sell_price = sell_price * (1 - sell_impact)
+
+                    tokens = size_usd / effective_buy_price
+                    revenue = tokens * effective_sell_price
+
+                    # Estimate fees (swap fee comes from the ladder table)
+                    # Realistic gas fees (increased for safety)
+                    gas_fees = GAS_FEES_USD
+                    
+                    gross_profit = revenue - size_usd
+                    net_profit = gross_profit - swap_fees - gas_fees
+                    
+                    # Additional profit validation
+                    profit_margin = net_profit / size_usd * 100  # Profit as percentage of investment
+                    
+                    # Always log profit calculations for debugging
+                    logger.info(f"{token.symbol}: Size ${size_usd}")
+                    logger.info(f"  Buy price: ${buy_price:.8f}, Sell price: ${sell_price:.8f}")
+                    logger.info(f"  Price diff: {price_diff_pct:.3f}%")
+                    logger.info(f"  Gross profit: ${gross_profit:.6f}")
+                    logger.info(f"  Swap fees: ${swap_fees:.6f}")
+                    logger.info(f"  Gas fees: ${gas_fees:.6f}")
+                    logger.info(f"  Net profit: ${net_profit:.6f}")
+                    logger.info(f"  Profit margin: {profit_margin:.3f}%")
+                    logger.info(f"  Min required: ${min_profit_usd}")
+
+                    # Extra validation: ensure profit margin is at least 1%
+                    min_profit_margin = MIN_PROFIT_MARGIN_PCT
+
+                    if net_profit >= min_profit_usd and profit_margin >= min_profit_margin:
+                        now = datetime.utcnow()
+                        opportunity = ArbitrageOpportunity(
+                            id=f"{token.symbol}_{next(_OPP_SEQ)}",
+                            token=token,
+                            buy_dex=buy_dex,
+                            sell_dex=sell_dex,
+                            buy_price=buy_price,
+                            sell_price=sell_price,
+                            size_usd=size_usd,
+                            expected_profit=net_profit,
+                            price_impact=total_impact,
+                            timestamp=now,
+                            expires_at=now + timedelta(seconds=10),
+                            expires_ns=time.monotonic_ns() + 10 * 10**9
+                        )
+                        
+                        logger.info(f"OPPORTUNITY FOUND: {token.symbol} - Size: ${size_usd}, Expected profit: ${net_profit:.2f} ({profit_margin:.2f}% margin)")
+                        return [opportunity]  # Found profitable size, move to next token
+                    else:
+                        if net_profit < min_profit_usd:
+                            logger.info(f"{token.symbol}: Not profitable enough. Net profit ${net_profit:.4f} < Required ${min_profit_usd}")
+                        else:
+                            logger.info(f"{token.symbol}: Profit margin too low. {profit_margin:.3f}% < Required {min_profit_margin}%")
+
+                return []
+
+            except Exception:
+                # logger.exception defers traceback formatting to the
+                # handler instead of walking the stack onto stderr inline
+                logger.exception("Error finding opportunities for %s", token.symbol)
+                return []
+
+    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> TradeResult:
+        """Execute an arbitrage opportunity with safety checks"""
+        start_time = time.time()
+        
+        # Check if still valid
+        if not opportunity.is_valid():
+            return TradeResult(
+                opportunity_id=opportunity.id,
+                success=False,
+                buy_tx=None,
+                sell_tx=None,
+                actual_profit=None,
+                error="Opportunity expired",
+                gas_used=0.0,
+                execution_time=0
+            )
+        
+        # Risk check
+        if self.daily_loss >= self.max_daily_loss:
+            return TradeResult(
+                opportunity_id=opportunity.id,
+                success=False,
+                buy_tx=None,
+                sell_tx=None,
+                actual_profit=None,
+                error="Daily loss limit reached",
+                gas_used=0.0,
+                execution_time=0
+            )
+        
+        async with self.execution_lock:
+            try:
+                logger.info(f"Executing arbitrage: {opportunity.token.symbol}")
+                logger.info(f"Buy on {opportunity.buy_dex.value} at {opportunity.buy_price}")
+                logger.info(f"Sell on {opportunity.sell_dex.value} at {opportunity.sell_price}")
+                logger.info(f"Expected profit: ${opportunity.expected_profit}")
+                
+                # Final profit validation before execution
+                min_profit_margin = MIN_PROFIT_MARGIN_PCT
+                expected_margin = (opportunity.expected_profit / opportunity.size_usd) * 100
+                
+                if expected_margin < min_profit_margin:
+                    logger.warning(f"Skipping trade: profit margin {expected_margin:.2f}% below minimum {min_profit_margin}%")
+                    raise Exception(f"Profit margin too low: {expected_margin:.2f}%")
+                
+                # Re-verify opportunity is still profitable before execution
+                logger.info("Re-verifying prices before execution...")
+                
+                # Get fresh prices from both venues in one round-trip;
+                # cached quotes are fine as long as they're under 1s old
+                fresh_jupiter_data, fresh_raydium_data = await asyncio.gather(
+                    self.get_jupiter_price(opportunity.token, max_age=1.0),
+                    self.get_raydium_price(opportunity.token, max_age=1.0),
+                    return_exceptions=True
+                )
+                if isinstance(fresh_jupiter_data, BaseException):
+                    fresh_jupiter_data = None
+                if isinstance(fresh_raydium_data, BaseException):
+                    fresh_raydium_data = None
+
+                if not fresh_jupiter_data or not fresh_raydium_data:
+                    raise Exception("Failed to get fresh prices for verification")
+                
+                fresh_jupiter_price, _ = fresh_jupiter_data
+                fresh_raydium_price, _ = fresh_raydium_data
+                
+                # Determine current buy/sell prices
+                if opportunity.buy_dex == DEX.JUPITER:
+                    current_buy_price = fresh_jupiter_price
+                    current_sell_price = fresh_raydium_price
+                else:
+                    current_buy_price = fresh_raydium_price
+                    current_sell_price = fresh_jupiter_price
+                
+                # Calculate fresh profit
+                fresh_price_diff = abs(current_sell_price - current_buy_price)
+                fresh_price_diff_pct = (fresh_price_diff / current_buy_price) * 100
+                
+                logger.info(f"Fresh prices - Buy: ${current_buy_price:.8f}, Sell: ${current_sell_price:.8f}, Diff: {fresh_price_diff_pct:.3f}%")
+                
+                # Abort if spread has narrowed too much
+                min_required_spread = 1.2  # 1.2% minimum to account for fees and slippage
+                if fresh_price_diff_pct < min_required_spread:
+                    raise Exception(f"Price spread too narrow: {fresh_price_diff_pct:.3f}% < {min_required_spread}% required")
+                
+                # Get wallet balance
+                await self.rate_limiters["rpc"].acquire()
+                balance_response = await self.client.get_balance(self.wallet.pubkey())
+                sol_balance = balance_response.value / 1e9
+                
+                if sol_balance < 0.1:  # Need at least 0.1 SOL for fees
+                    raise Exception("Insufficient SOL balance for fees")
+                
+                # Check USDC balance
+                usdc_balance = await self.get_usdc_balance_cached()
+                logger.info(f"USDC Balance: ${usdc_balance:.2f}")
+                
+                if usdc_balance < opportunity.size_usd:
+                    raise Exception(f"Insufficient USDC balance. Have ${usdc_balance:.2f}, need ${opportunity.size_usd}")
+                
+                # Bundled execution is atomic (no mid-trade leg
+                # exposure) and skips the confirmation wait between legs,
+                # so prefer it whenever the client is configured; the
+                # sequential path remains as a fallback when the bundle
+                # cannot be submitted
+                if self.use_jito and self.jito_client:
+                    try:
+                        result = await self._execute_jito(opportunity, start_time)
+                    except Exception as e:
+                        logger.warning(f"Jito execution failed ({e}); falling back to sequential")
+                        result = await self._execute_sequential(opportunity, usdc_balance, start_time)
+                else:
+                    result = await self._execute_sequential(opportunity, usdc_balance, start_time)
+
+            except Exception as e:
+                logger.error(f"Arbitrage execution failed: {e}")
+                
+                result = TradeResult(
+                    opportunity_id=opportunity.id,
+                    success=False,
+                    buy_tx=None,
+                    sell_tx=None,
+                    actual_profit=None,
+                    error=str(e),
+                    gas_used=0.005,  # Failed tx still costs gas
+                    execution_time=time.time() - start_time
+                )
+                
+                # Update daily loss
+                self.daily_loss += 10  # Assume $10 loss on failed trade
+            
+            # Save trade result
+            await self.db.save_trade(opportunity, result)
+            
+            return result
+
+    async def _execute_jito(self, opportunity: ArbitrageOpportunity,
+                            start_time: float) -> TradeResult:
+        """Execute both legs atomically as a Jito bundle"""
+        logger.info("Using Jito bundle for atomic execution")
+
+        # Build both transactions
+        buy_amount = int(opportunity.size_usd * 1_000_000)  # USDC has 6 decimals
+
+        # Build buy transaction
+        if opportunity.buy_dex == DEX.JUPITER:
+            buy_tx = await TransactionBuilder.build_jupiter_swap(
+                self.client,
+                self.wallet,
+                self.config['usdc_mint'],
+                opportunity.token.mint,
+                buy_amount,
+                slippage_bps=100,
+                priority_fee=0,  # No priority fee needed with Jito
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            )
+        else:
+            buy_tx = None
+
+        if not buy_tx:
+            raise Exception("Failed to build buy transaction")
+
+        # Build sell transaction
+        dec_pow = (self._decimals_pow.get(opportunity.token.mint)
+                   or opportunity.token.scale)
+        tokens_received = opportunity.size_usd / opportunity.buy_price
+        sell_amount = int(tokens_received * dec_pow)
+
+        if opportunity.sell_dex == DEX.JUPITER:
+            sell_tx = await TransactionBuilder.build_jupiter_swap(
+                self.client,
+                self.wallet,
+                opportunity.token.mint,
+                self.config['usdc_mint'],
+                sell_amount,
+                slippage_bps=100,
+                priority_fee=0,
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            )
+        else:
+            sell_tx = None
+
+        if not sell_tx:
+            raise Exception("Failed to build sell transaction")
+
+        # Calculate tip for Jito
+        expected_profit_lamports = int(opportunity.expected_profit * 1e9 / 150)  # Assuming SOL = $150
+        tip_lamports = self.jito_client.calculate_optimal_tip(expected_profit_lamports)
+
+        # Build bundle with tip in last transaction
+        bundle_txs = await self.jito_client.build_bundle_transactions(
+            [[buy_tx.message.instructions], [sell_tx.message.instructions]],
+            self.wallet,
+            tip_lamports
+        )
+
+        # Simulate before paying the tip: a bundle that would fail on
+        # chain is dropped here for free instead of burning the tip
+        sim_ok, _sim_results, sim_err = await self.jito_client.simulate_bundle(bundle_txs)
+        if not sim_ok:
+            raise Exception(f"Bundle simulation failed: {sim_err}")
+
+        # Send bundle
+        success, bundle_id, error = await self.jito_client.send_bundle(bundle_txs)
+
+        if success:
+            # Wait for confirmation
+            confirmed = await self.jito_client.wait_for_bundle_confirmation(bundle_id, timeout=30)
+
+            if confirmed:
+                gas_used = tip_lamports / 1e9  # Convert tip to SOL
+                actual_profit = opportunity.expected_profit - gas_used * 150  # SOL to USD
+
+                result = TradeResult(
+                    opportunity_id=opportunity.id,
+                    success=True,
+                    buy_tx=f"jito_bundle_{bundle_id}",
+                    sell_tx=f"jito_bundle_{bundle_id}",
+                    actual_profit=actual_profit,
+                    error=None,
+                    gas_used=gas_used,
+                    execution_time=time.time() - start_time
+                )
+
+                logger.info(f"Jito bundle executed successfully! Bundle ID: {bundle_id}")
+                logger.info(f"Actual profit: ${actual_profit}")
+            else:
+                raise Exception(f"Bundle not confirmed: {bundle_id}")
+        else:
+            raise Exception(f"Failed to send bundle: {error}")
+
+        return result
+
+    async def _execute_sequential(self, opportunity: ArbitrageOpportunity,
+                                  usdc_balance: float,
+                                  start_time: float) -> TradeResult:
+        """Execute buy then sell as separate transactions"""
+        logger.info("Using sequential transaction execution")
+
+        # Execute buy transaction
+        buy_amount = int(opportunity.size_usd * 1_000_000)  # USDC has 6 decimals
+
+        if opportunity.buy_dex == DEX.JUPITER:
+            buy_tx = await TransactionBuilder.build_jupiter_swap(
+                self.client,
+                self.wallet,
+                self.config['usdc_mint'],
+                opportunity.token.mint,
+                buy_amount,
+                slippage_bps=100,  # 1% slippage
+                priority_fee=self.priority_fee,
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            )
+        else:
+            # Use Jupiter routing for Raydium
+            buy_tx = await TransactionBuilder.build_raydium_swap_via_jupiter(
+                self.client,
+                self.wallet,
+                self.config['usdc_mint'],
+                opportunity.token.mint,
+                buy_amount,
+                slippage_bps=100,
+                priority_fee=self.priority_fee,
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            )
+
+        if not buy_tx:
+            raise Exception("Failed to build buy transaction")
+
+        # The sell amount is derived from the quoted buy price, not the
+        # on-chain fill, so the sell quote needs nothing from the buy
+        # leg: launch its build before the buy is even signed and the
+        # whole quote round-trip hides behind sign + send + confirm
+        dec_pow = (self._decimals_pow.get(opportunity.token.mint)
+                   or opportunity.token.scale)
+        tokens_received = opportunity.size_usd / opportunity.buy_price
+        verify_balance = self.config.get('verify_token_balance', False)
+        if verify_balance:
+            sell_amount = int(tokens_received * dec_pow)
+        else:
+            # Shave 1% up front to absorb fees/rounding so the
+            # router never sees an inflated amount; the 2%
+            # slippage covers the rest and we skip the balance RPC
+            sell_amount = int(tokens_received * 0.99 * dec_pow)
+        logger.info(f"Building sell transaction for {sell_amount} tokens (raw amount)")
+
+        if opportunity.sell_dex == DEX.JUPITER:
+            sell_build_task = asyncio.create_task(TransactionBuilder.build_jupiter_swap(
+                self.client,
+                self.wallet,
+                opportunity.token.mint,
+                self.config['usdc_mint'],
+                sell_amount,
+                slippage_bps=200,  # Increased slippage to 2%
+                priority_fee=self.priority_fee,
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            ))
+        else:
+            # Use Jupiter routing for Raydium
+            sell_build_task = asyncio.create_task(TransactionBuilder.build_raydium_swap_via_jupiter(
+                self.client,
+                self.wallet,
+                opportunity.token.mint,
+                self.config['usdc_mint'],
+                sell_amount,
+                slippage_bps=200,  # Increased slippage to 2%
+                priority_fee=self.priority_fee,
+                session=self._http_session(),
+                user_pubkey_str=self.wallet_pubkey_str
+            ))
+
+        # Sign and send buy transaction
+        try:
+            # Re-sign with the cached solders keypair
+            signed_tx = VersionedTransaction(buy_tx.message, [self._signer_keypair])
+
+            await self.rate_limiters["rpc"].acquire()
+            logger.info(f"Sending buy transaction...")
+
+            # Send the raw transaction
+            tx_bytes = bytes(signed_tx)
+            buy_result = await self.client.send_raw_transaction(tx_bytes)
+            buy_tx_id = str(buy_result.value)
+
+        except Exception as e:
+            logger.error(f"Error signing/sending buy transaction: {e}")
+            sell_build_task.cancel()
+            raise
+
+        logger.info(f"Buy transaction sent: {buy_tx_id}")
+
+        # Wait for confirmation (websocket subscribe, polling fallback)
+        try:
+            await self._await_signature(buy_result.value, timeout=15.0,
+                                        label="Buy transaction")
+        except Exception:
+            sell_build_task.cancel()
+            raise
+
+        sell_tx = await sell_build_task
+
+        if not sell_tx:
+            raise Exception("Failed to build sell transaction")
+
+        if verify_balance:
+            # Double check token balance before selling; the buy is already
+            # confirmed, so the ATA fetch doubles as the settle wait
+            logger.info("Verifying token balance before sell...")
+            try:
+                verified_balance = await self._get_token_balance_raw(opportunity.token.mint)
+                logger.info(f"Verified token balance: {verified_balance}")
+            except Exception as e:
+                logger.error(f"Error verifying balance: {e}")
+                verified_balance = 0
+
+            if verified_balance < sell_amount:
+                logger.warning(f"Adjusting sell amount from {sell_amount} to {verified_balance}")
+                sell_amount = verified_balance
+
+                # Rebuild transaction with correct amount
+                if opportunity.sell_dex == DEX.JUPITER:
+                    sell_tx = await TransactionBuilder.build_jupiter_swap(
+                        self.client,
+                        self.wallet,
+                        opportunity.token.mint,
+                        self.config['usdc_mint'],
+                        sell_amount,
+                        slippage_bps=200,
+                        priority_fee=self.priority_fee,
+                        session=self._http_session(),
+                        user_pubkey_str=self.wallet_pubkey_str
+                    )
+                else:
+                    sell_tx = await TransactionBuilder.build_raydium_swap_via_jupiter(
+                        self.client,
+                        self.wallet,
+                        opportunity.token.mint,
+                        self.config['usdc_mint'],
+                        sell_amount,
+                        slippage_bps=200,
+                        priority_fee=self.priority_fee,
+                        session=self._http_session(),
+                        user_pubkey_str=self.wallet_pubkey_str
+                    )
+
+        if not sell_tx:
+            raise Exception("Failed to build sell transaction")
+
+        # Sign and send sell transaction using the same method as buy
+        try:
+            signed_tx = VersionedTransaction(sell_tx.message, [self._signer_keypair])
+
+
+            await self.rate_limiters["rpc"].acquire()
+            logger.info(f"Sending sell transaction with amount: {sell_amount}")
+
+            # Send the raw transaction
+            tx_bytes = bytes(signed_tx)
+            sell_result = await self.client.send_raw_transaction(tx_bytes)
+            sell_tx_id = str(sell_result.value)
+
+            logger.info(f"Sell transaction sent: {sell_tx_id}")
+
+            # Wait for confirmation (websocket subscribe, polling fallback)
+            await self._await_signature(sell_result.value, timeout=15.0,
+                                        label="Sell transaction")
+
+        except Exception as e:
+            logger.error(f"Error signing/sending sell transaction: {e}")
+            # Log more details about the error
+            if "Custom program error" in str(e):
+                logger.error("This usually means insufficient token balance or slippage")
+                logger.error(f"Attempted to sell {sell_amount} tokens")
+            raise
+
+        # Get actual USDC balance after trades to calculate real profit
+        final_usdc_balance = await self.get_usdc_balance()
+        usdc_received = final_usdc_balance - usdc_balance + opportunity.size_usd
+
+        # Calculate actual profit based on real results
+        gas_used = 0.00001 * 2  # Approximate gas for both transactions
+        actual_profit = usdc_received - opportunity.size_usd - (gas_used * 150)  # Convert gas to USD
+
+        logger.info(f"Trade complete:")
+        logger.info(f"  Started with: ${opportunity.size_usd} USDC")
+        logger.info(f"  Received: ${usdc_received} USDC")
+        logger.info(f"  Gas cost: ${gas_used * 150:.4f}")
+        logger.info(f"  Actual profit/loss: ${actual_profit:.4f}")
+
+        result = TradeResult(
+            opportunity_id=opportunity.id,
+            success=True,
+            buy_tx=buy_tx_id,
+            sell_tx=sell_tx_id,
+            actual_profit=actual_profit,
+            error=None,
+            gas_used=gas_used,
+            execution_time=time.time() - start_time
+        )
+
+        if actual_profit < 0:
+            logger.warning(f"Trade resulted in loss of ${abs(actual_profit):.4f}")
+            self.daily_loss += abs(actual_profit)
+
+            # Analyze why the trade failed
+            logger.warning("Trade analysis:")
+            logger.warning(f"  Expected profit: ${opportunity.expected_profit:.4f}")
+            logger.warning(f"  Actual profit: ${actual_profit:.4f}")
+            logger.warning(f"  Difference: ${opportunity.expected_profit - actual_profit:.4f}")
+            logger.warning(f"  Execution time: {result.execution_time:.1f} seconds")
+
+            # Log current prices to see if market moved
+            current_jupiter = await self.get_jupiter_price(opportunity.token)
+            current_raydium = await self.get_raydium_price(opportunity.token)
+            if current_jupiter and current_raydium:
+                j_price, _ = current_jupiter
+                r_price, _ = current_raydium
+                logger.warning(f"  Current prices - Jupiter: ${j_price:.8f}, Raydium: ${r_price:.8f}")
+                logger.warning(f"  Original prices - Buy: ${opportunity.buy_price:.8f}, Sell: ${opportunity.sell_price:.8f}")
+
+        return result
+    
+    async def check_and_rebalance_usdc(self, min_usdc_needed: float = 20.0) -> bool:
+        """Check USDC balance and rebalance if needed"""
+        try:
+            usdc_balance = await self.get_usdc_balance()
+            
+            if usdc_balance < min_usdc_needed:
+                logger.info(f"USDC balance ${usdc_balance:.2f} below minimum ${min_usdc_needed}")
+                
+                # Get all token balances
+                for token in self.tokens:
+                    token_accounts = await self.client.get_token_accounts_by_owner_json_parsed(
+                        self.wallet.pubkey(),
+                        self._token_opts[token.mint]
+                    )
+                    
+                    if token_accounts.value:
+                        for account in token_accounts.value:
+                            try:
+                                parsed_info = account.account.data.parsed['info']
+                                balance = parsed_info['tokenAmount']['uiAmount']
+                                if balance and balance > 0:
+                                    # Get current price
+                                    jupiter_data = await self.get_jupiter_price(token)
+                                    if jupiter_data:
+                                        price, _ = jupiter_data
+                                        value_usd = float(balance) * float(price)
+                                        
+                                        if value_usd > 5:  # Only rebalance if worth more than $5
+                                            logger.info(f"Found {balance} {token.symbol} worth ${value_usd:.2f}")
+                                            
+                                            # Sell half to USDC
+                                            sell_amount = int(float(balance) * 0.5 * token.scale)
+                                            
+                                            sell_tx = await TransactionBuilder.build_jupiter_swap(
+                                                self.client,
+                                                self.wallet,
+                                                token.mint,
+                                                self.config['usdc_mint'],
+                                                sell_amount,
+                                                slippage_bps=100,
+                                                priority_fee=self.priority_fee,
+                                                session=self._http_session(),
+                                                user_pubkey_str=self.wallet_pubkey_str
+                                            )
+                                            
+                                            if sell_tx:
+                                                # Sign and send
+                                                from solders.transaction import VersionedTransaction as VT
+                                                signed_tx = VT(sell_tx.message, [self.wallet])
+                                                tx_bytes = bytes(signed_tx)
+                                                result = await self.client.send_raw_transaction(tx_bytes)
+                                                
+                                                logger.info(f"Rebalanced {token.symbol} to USDC: {result.value}")
+                                                await self._await_signature(result.value, timeout=15.0,
+                                                                            label="Rebalance transaction")
+                                                return True
+                                                
+                            except Exception as e:
+                                logger.error(f"Error checking {token.symbol} balance: {e}")
+                
+            return usdc_balance >= min_usdc_needed
+            
+        except Exception as e:
+            logger.error(f"Rebalancing error: {e}")
+            return False
+    
+    async def health_check(self):
+        """Periodic health check"""
+        while self.running:
+            try:
+                # Check RPC connection
+                await self.rate_limiters["rpc"].acquire()
+                block_height = await self.client.get_block_height()
+                
+                # Check wallet balance (push-updated when the stream is up)
+                if self._balance_stream_live and self._sol_balance is not None:
+                    sol_balance = self._sol_balance
+                else:
+                    balance_response = await self.client.get_balance(self.wallet.pubkey())
+                    sol_balance = balance_response.value / 1e9
+                
+                # Estimate USD value (simplified)
+                usd_value = sol_balance * 150  # Assume $150/SOL
+                balance_gauge.set(usd_value)
+                
+                # Reset daily loss counter if new day
+                if datetime.utcnow().date() > self.last_loss_reset.date():
+                    self.daily_loss = 0.0
+                    self.last_loss_reset = datetime.utcnow()
+                
+                # Clear expired cache entries
+                self.price_cache.clear_expired()
+                
+                logger.info(f"Health check OK. Block: {block_height.value}, Balance: {sol_balance:.4f} SOL")
+                
+            except Exception as e:
+                logger.error(f"Health check failed: {e}")
+            
+            await asyncio.sleep(60)  # Check every minute
+    
+    async def monitor_loop(self):
+        """Main monitoring loop"""
+        logger.info("Starting production arbitrage monitor...")
+        
+        # Check USDC balance at start
+        usdc_balance = await self.get_usdc_balance()
+        logger.info(f"Starting USDC balance: ${usdc_balance:.2f}")
+        
+        consecutive_errors = 0
+        checks_count = 0
+        
+        while self.running:
+            try:
+                checks_count += 1
+                logger.info(f"[Check #{checks_count}] Scanning for arbitrage opportunities...")
+                
+                # Find opportunities
+                opportunities = await self.find_arbitrage_opportunities()
+                
+                # Check if we need to rebalance USDC before executing trades
+                if len(opportunities) > 0:
+                    usdc_balance = await self.get_usdc_balance()
+                    if usdc_balance < 10:  # Below minimum trade size
+                        logger.info("Low USDC balance, attempting to rebalance...")
+                        rebalanced = await self.check_and_rebalance_usdc(min_usdc_needed=20.0)
+                        if rebalanced:
+                            logger.info("Rebalancing successful, continuing with trades")
+                        else:
+                            logger.warning("Could not rebalance, skipping this cycle")
+                            await asyncio.sleep(30)
+                            continue
+                
+                if opportunities:
+                    logger.info(f"Found {len(opportunities)} opportunities")
+                    
+                    # Log each opportunity
+                    for i, opp in enumerate(opportunities):
+                        logger.info(f"  Opportunity {i+1}: {opp.token.symbol}")
+                        logger.info(f"    Buy on {opp.buy_dex.value} at ${opp.buy_price:.8f}")
+                        logger.info(f"    Sell on {opp.sell_dex.value} at ${opp.sell_price:.8f}")
+                        logger.info(f"    Size: ${opp.size_usd}, Expected profit: ${opp.expected_profit:.2f}")
+
+                    # Select the most profitable without fully sorting;
+                    # only one trade executes per cycle to avoid
+                    # overexposure
+                    tasks = []
+                    for opp in heapq.nlargest(1, opportunities,
+                                              key=lambda o: o.expected_profit):
+                        if opp.expected_profit >= self.min_profit_usd:
+                            logger.info(f"Executing arbitrage for {opp.token.symbol}...")
+                            tasks.append(self.execute_arbitrage(opp))
+                    
+                    if tasks:
+                        results = await asyncio.gather(*tasks, return_exceptions=True)
+                        
+                        for result in results:
+                            if isinstance(result, Exception):
+                                logger.error(f"Execution error: {result}")
+                            elif isinstance(result, TradeResult) and result.success:
+                                # If we successfully executed a trade, skip remaining opportunities
+                                # to avoid overexposure
+                                logger.info("Successfully executed trade, skipping remaining opportunities")
+                else:
+                    # Log token prices periodically
+                    if checks_count % 10 == 0:  # Every 10 checks
+                        shown = self.tokens[:3]  # Show first 3 tokens
+                        prices = await self.get_prices_batch(shown)
+                        lines = [
+                            f"  {t.symbol}: Jupiter=${j:.8f}, Raydium=${r:.8f}, "
+                            f"Diff={abs(j - r) / min(j, r) * 100:.2f}%"
+                            for t in shown
+                            for j, r in (prices[t.mint],)
+                            if j and r
+                        ]
+                        logger.info("No opportunities found. Current token prices:\n"
+                                    + "\n".join(lines))
+                
+                consecutive_errors = 0
+                
+            except Exception as e:
+                consecutive_errors += 1
+                logger.error(f"Monitor loop error: {e}")
+                
+                if consecutive_errors > 5:
+                    logger.error("Too many consecutive errors, pausing...")
+                    await asyncio.sleep(30)
+                    consecutive_errors = 0
+            
+            # Dynamic sleep based on market activity
+            sleep_time = self.config.get('check_interval', 5)
+            if len(opportunities) == 0:
+                sleep_time = min(sleep_time * 1.5, 30)  # Slow down gradually if no opportunities
+            
+            logger.debug(f"Sleeping for {sleep_time} seconds...")
+            # Sleep is a timeout, not a grid: a significant quote move in
+            # the price stream wakes the loop immediately
+            try:
+                await asyncio.wait_for(self._scan_wake.wait(), timeout=sleep_time)
+                logger.debug("Woken early by price movement")
+            except asyncio.TimeoutError:
+                pass
+            self._scan_wake.clear()
+
+    async def start(self):
+        """Start the bot"""
+        self.running = True
+
+        # Open the shared HTTP session up front so the first scan
+        # doesn't pay connection setup
+        self._http_session()
+
+        # Initialize Jito client if enabled, on the shared session so
+        # bundle sends reuse the warm connection pool
+        if self.jito_client:
+            self.jito_client.session = self._http_session()
+            await self.jito_client.__aenter__()
+        
+        # Start prometheus metrics server - with error handling
+        try:
+            # Try different ports if 8000 is taken
+            ports_to_try = [8000, 8001, 8002, 8003, 9090]
+            metrics_started = False
+            
+            for port in ports_to_try:
+                try:
+                    prometheus_client.start_http_server(port)
+                    logger.info(f"Metrics server started on port {port}")
+                    metrics_started = True
+                    break
+                except OSError as e:
+                    if "Address already in use" in str(e) or "access a socket" in str(e):
+                        logger.warning(f"Port {port} is already in use, trying next port...")
+                        continue
+                    else:
+                        raise
+            
+            if not metrics_started:
+                logger.warning("Could not start metrics server - all ports in use. Continuing without metrics.")
+        except Exception as e:
+            logger.warning(f"Failed to start metrics server: {e}. Continuing without metrics.")
+        
+        # Create tasks
+        tasks = [
+            asyncio.create_task(self.monitor_loop()),
+            asyncio.create_task(self.health_check()),
+            asyncio.create_task(self._jupiter_price_stream()),
+            asyncio.create_task(self._balance_stream())
+        ]
+        
+        # Handle shutdown
+        def signal_handler(sig, frame):
+            logger.info("Shutdown signal received")
+            self.running = False
+        
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.error(f"Bot error: {e}")
+        finally:
+            self.running = False
+            await self.client.close()
+            if self.http and not self.http.closed:
+                await self.http.close()
+            if self.jup_http is not None and not self.jup_http.is_closed:
+                await self.jup_http.aclose()
+            if self.jito_client:
+                await self.jito_client.__aexit__(None, None, None)
+            if self.db._flusher_task:
+                self.db._flusher_task.cancel()
+            if self.db._metrics_task:
+                self.db._metrics_task.cancel()
+            # Wait for the cancelled flusher to actually exit: its
+            # CancelledError handler requeues any rows it had popped, and
+            # the final flush below must run after that, not before
+            await asyncio.gather(
+                *(t for t in (self.db._flusher_task, self.db._metrics_task) if t),
+                return_exceptions=True
+            )
+            await self.db.flush()
+            logger.info("Bot stopped")
+
+async def main():
+    """Main entry point"""
+    # Check for required files
+    if not os.path.exists('config/config.json'):
+        print("Creating default config.json...")
+        os.makedirs('config', exist_ok=True)
+        default_config = {
+            "rpc_endpoint": "https://api.mainnet-beta.solana.com",
+            "wallet_path": "wallet.json",
+            "usdc_mint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+            "min_profit_usd": 10.0,
+            "max_position_size": 5000.0,
+            "max_price_impact": 0.01,
+            "min_price_difference": 0.007,  # 0.7% minimum price difference
+            "priority_fee_microlamports": 10000,
+            "max_daily_loss": 100.0,
+            "check_interval": 5,
+            "use_jito_bundles": False,  # Disabled by default
+            "tokens": {
+                "BONK": {
+                    "mint": "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
+                    "decimals": 5,
+                    "min_liquidity": 50000
+                },
+                "WIF": {
+                    "mint": "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm",
+                    "decimals": 6,
+                    "min_liquidity": 100000
+                },
+                "JUP": {
+                    "mint": "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN",
+                    "decimals": 6,
+                    "min_liquidity": 100000
+                }
+            }
+        }
+        
+        with open('config/config.json', 'w') as f:
+            f.write(json_dumps_pretty(default_config))
+        
+        print("Please configure config/config.json and add your wallet")
+        return
+    
+    # Create necessary directories
+    os.makedirs('logs', exist_ok=True)
+    os.makedirs('data', exist_ok=True)
+    
+    # Start bot
+    bot = ProductionArbitrageBot()
+    await bot.start()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PRODUCTION SOLANA ARBITRAGE BOT v2.0")
+    print("=" * 60)
     asyncio.run(main())
\ No newline at end of file
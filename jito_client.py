@@ -4,6 +4,7 @@ Jito Bundle Client for Atomic Transaction Execution
 
 import asyncio
 import aiohttp
+import itertools
 import json
 import time
 from typing import List, Tuple, Optional, Dict, Any
@@ -18,8 +19,27 @@ from solders.instruction import Instruction
 from solana.rpc.async_api import AsyncClient
 import base58
 
+# Fast JSON - same pattern as the bot module: orjson when installed,
+# stdlib otherwise
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 @dataclass
 class JitoConfig:
     """Jito configuration"""
@@ -39,29 +59,73 @@ class JitoConfig:
                 "DttWaMuVvTiduZRnguLF7jNxTgiMBZ1hyAumKUiL2KRL",
                 "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT"
             ]
+        # The accounts are static, so decode the base58 once here rather
+        # than on every bundle send
+        self.tip_pubkeys = [Pubkey.from_string(s) for s in self.tip_accounts]
 
 class JitoClient:
     """Client for interacting with Jito Labs block engine"""
     
-    def __init__(self, config: JitoConfig, solana_client: AsyncClient):
+    def __init__(self, config: JitoConfig, solana_client: AsyncClient,
+                 session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.solana_client = solana_client
-        self.session = None
-        self._tip_account_index = 0
-        
+        # A shared session (passed in or set before __aenter__) reuses the
+        # caller's warm connection pool; otherwise we own a private one
+        self.session = session
+        self._own_session = False
+        self._tip_rotation = itertools.cycle(config.tip_pubkeys)
+        # Rolling blockhash kept warm by a background task so bundle
+        # builds don't pay an RPC round-trip on the send path
+        self._cached_blockhash = None
+        self._blockhash_fetched_at = 0.0
+        self._blockhash_task: Optional[asyncio.Task] = None
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+            self._own_session = True
+        self._blockhash_task = asyncio.create_task(self._refresh_blockhash_loop())
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._blockhash_task:
+            self._blockhash_task.cancel()
+            self._blockhash_task = None
+        if self.session and self._own_session:
             await self.session.close()
+
+    async def _refresh_blockhash_loop(self):
+        """Keep a recent blockhash cached in the background
+
+        Blockhashes stay valid for ~150 slots (about a minute), so a
+        refresh every few seconds leaves plenty of margin while taking
+        the RPC round-trip off the bundle-build critical path.
+        """
+        while True:
+            try:
+                resp = await self.solana_client.get_latest_blockhash()
+                self._cached_blockhash = resp.value.blockhash
+                self._blockhash_fetched_at = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Blockhash refresh failed: {e}")
+            await asyncio.sleep(5)
+
+    async def _get_recent_blockhash(self):
+        """Return the cached blockhash, fetching only when it is stale"""
+        # 30 s is well inside the ~60 s validity window
+        if (self._cached_blockhash is not None
+                and time.monotonic() - self._blockhash_fetched_at < 30):
+            return self._cached_blockhash
+
+        resp = await self.solana_client.get_latest_blockhash()
+        self._cached_blockhash = resp.value.blockhash
+        self._blockhash_fetched_at = time.monotonic()
+        return self._cached_blockhash
     
     def get_next_tip_account(self) -> Pubkey:
         """Get next tip account in rotation"""
-        tip_account = self.config.tip_accounts[self._tip_account_index]
-        self._tip_account_index = (self._tip_account_index + 1) % len(self.config.tip_accounts)
-        return Pubkey.from_string(tip_account)
+        return next(self._tip_rotation)
     
     def calculate_optimal_tip(self, expected_profit_lamports: int) -> int:
         """Calculate optimal tip amount based on expected profit"""
@@ -84,8 +148,8 @@ class JitoClient:
         """Build a bundle of transactions with tip in the last one"""
         transactions = []
         
-        # Get recent blockhash
-        recent_blockhash = (await self.solana_client.get_latest_blockhash()).value.blockhash
+        # Recent blockhash, normally served from the background cache
+        recent_blockhash = await self._get_recent_blockhash()
         
         # Build each transaction
         for i, instructions in enumerate(instructions_list):
@@ -136,19 +200,19 @@ class JitoClient:
                 "params": [serialized_txs]
             }
             
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
             # Send to Jito
             async with self.session.post(
                 f"{self.config.block_engine_url}/bundles",
-                json=bundle_data,
-                headers=headers,
+                data=json_dumps(bundle_data),
+                headers=_JSON_HEADERS,
                 timeout=aiohttp.ClientTimeout(total=30)
             ) as response:
+                # Read the body once as bytes; orjson parses them directly
+                # and the error path decodes only a short prefix instead of
+                # the whole payload
+                raw = await response.read()
                 if response.status == 200:
-                    result = await response.json()
+                    result = json_loads(raw)
                     if "result" in result:
                         bundle_id = result["result"]
                         logger.info(f"Bundle sent successfully: {bundle_id}")
@@ -158,7 +222,8 @@ class JitoClient:
                         logger.error(f"Bundle rejected: {error}")
                         return False, None, str(error)
                 else:
-                    error = f"HTTP {response.status}: {await response.text()}"
+                    error = (f"HTTP {response.status}: "
+                             f"{raw[:512].decode(errors='replace')}")
                     logger.error(f"Failed to send bundle: {error}")
                     return False, None, error
                     
@@ -178,11 +243,12 @@ class JitoClient:
             
             async with self.session.post(
                 f"{self.config.block_engine_url}/bundles",
-                json=params,
+                data=json_dumps(params),
+                headers=_JSON_HEADERS,
                 timeout=aiohttp.ClientTimeout(total=10)
             ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = json_loads(await response.read())
                     if "result" in result and result["result"]:
                         return result["result"][0]
                 return None
@@ -196,25 +262,44 @@ class JitoClient:
         bundle_id: str,
         timeout: int = 30
     ) -> bool:
-        """Wait for bundle confirmation"""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            status = await self.get_bundle_status(bundle_id)
-            
-            if status:
-                bundle_status = status.get("confirmation_status")
-                if bundle_status == "confirmed":
-                    logger.info(f"Bundle {bundle_id} confirmed!")
-                    return True
-                elif bundle_status in ["failed", "rejected"]:
-                    logger.error(f"Bundle {bundle_id} failed: {status}")
-                    return False
-            
-            await asyncio.sleep(1)
-        
-        logger.warning(f"Bundle {bundle_id} confirmation timeout")
-        return False
+        """Wait for bundle confirmation
+
+        A watcher task polls the block engine at slot cadence (~400 ms)
+        and sets an Event the moment a terminal status lands, so the
+        waiter wakes immediately instead of on the old 1 s grid.
+        """
+        done = asyncio.Event()
+        confirmed = False
+
+        async def _watch():
+            nonlocal confirmed
+            while True:
+                status = await self.get_bundle_status(bundle_id)
+
+                if status:
+                    bundle_status = status.get("confirmation_status")
+                    if bundle_status == "confirmed":
+                        logger.info(f"Bundle {bundle_id} confirmed!")
+                        confirmed = True
+                        done.set()
+                        return
+                    elif bundle_status in ["failed", "rejected"]:
+                        logger.error(f"Bundle {bundle_id} failed: {status}")
+                        done.set()
+                        return
+
+                await asyncio.sleep(0.4)  # one Solana slot
+
+        watcher = asyncio.create_task(_watch())
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Bundle {bundle_id} confirmation timeout")
+            return False
+        finally:
+            watcher.cancel()
+
+        return confirmed
     
     async def simulate_bundle(
         self,
@@ -222,20 +307,26 @@ class JitoClient:
     ) -> Tuple[bool, Optional[List[Dict]], Optional[str]]:
         """Simulate bundle execution"""
         try:
+            # The simulations are independent RPC calls, so issue them in
+            # one gather: N serial round-trips become one
+            sim_results = await asyncio.gather(
+                *(self.solana_client.simulate_transaction(tx) for tx in transactions),
+                return_exceptions=True
+            )
+
             results = []
-            
-            for tx in transactions:
-                # Simulate each transaction
-                sim_result = await self.solana_client.simulate_transaction(tx)
-                
+            for sim_result in sim_results:
+                if isinstance(sim_result, BaseException):
+                    return False, None, f"Simulation failed: {sim_result}"
+
                 if sim_result.value.err:
                     return False, None, f"Simulation failed: {sim_result.value.err}"
-                
+
                 results.append({
                     "units_consumed": sim_result.value.units_consumed,
                     "logs": sim_result.value.logs
                 })
-            
+
             return True, results, None
             
         except Exception as e:
@@ -3,81 +3,136 @@
 """Analyze historical arbitrage opportunities from CSV files"""
 
 import csv
-import os
-from datetime import datetime
+import glob
+import sys
 from collections import defaultdict
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+def _scan_file(csv_file):
+    """Stream one CSV into running accumulators
+
+    Every group keeps just [count, profit sum, profit max, diff sum],
+    updated in one pass, so no per-row data survives the read loop.
+    Returns per-file partials that the caller merges.
+    """
+    by_token = defaultdict(lambda: [0, 0.0, float('-inf'), 0.0])
+    by_route = defaultdict(lambda: [0, 0.0, float('-inf'), 0.0])
+    by_hour = defaultdict(list)
+    total = 0
+
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        # Resolve column positions from the header once; plain tuple
+        # indexing then skips DictReader's per-row dict construction
+        header = next(reader, None)
+        if header is None:
+            return by_token, by_route, by_hour, total
+        i_sym, i_buy, i_sell, i_profit, i_diff, i_ts = (
+            header.index(c) for c in
+            ('symbol', 'buy_on', 'sell_on', 'net_profit', 'price_diff_pct', 'timestamp')
+        )
+
+        for row in reader:
+            net_profit = float(row[i_profit])
+            price_diff_pct = float(row[i_diff])
+
+            s = by_token[row[i_sym]]
+            s[0] += 1
+            s[1] += net_profit
+            if net_profit > s[2]:
+                s[2] = net_profit
+            s[3] += price_diff_pct
+
+            s = by_route[f"{row[i_buy]} -> {row[i_sell]}"]
+            s[0] += 1
+            s[1] += net_profit
+            if net_profit > s[2]:
+                s[2] = net_profit
+            s[3] += price_diff_pct
+
+            # Timestamps are always '%Y-%m-%d %H:%M:%S', so the hour
+            # is a fixed slice — no need to build a datetime per row
+            hour = int(row[i_ts][11:13])
+            by_hour[hour].append(net_profit)
+            total += 1
+
+    return by_token, by_route, by_hour, total
+
+def _merge_stats(target, partial):
+    """Fold one file's [count, sum, max, diff sum] groups into target"""
+    for key, (count, profit_sum, profit_max, diff_sum) in partial.items():
+        s = target[key]
+        s[0] += count
+        s[1] += profit_sum
+        if profit_max > s[2]:
+            s[2] = profit_max
+        s[3] += diff_sum
 
 def analyze_opportunities():
     """Analyze arbitrage opportunities from CSV files"""
-    # Find all CSV files
-    csv_files = [f for f in os.listdir('.') if f.startswith('arbitrage_opportunities_') and f.endswith('.csv')]
-    
+    # Find all CSV files (C-level pattern match, no per-entry filtering)
+    csv_files = glob.glob('arbitrage_opportunities_*.csv')
+
     if not csv_files:
         print("No opportunity CSV files found!")
         return
-    
-    all_opportunities = []
-    
-    # Read all CSV files
-    for csv_file in csv_files:
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                row['net_profit'] = float(row['net_profit'])
-                row['price_diff_pct'] = float(row['price_diff_pct'])
-                all_opportunities.append(row)
-    
-    if not all_opportunities:
+
+    by_token = defaultdict(lambda: [0, 0.0, float('-inf'), 0.0])
+    by_route = defaultdict(lambda: [0, 0.0, float('-inf'), 0.0])
+    by_hour = defaultdict(list)
+    total = 0
+
+    # Scan files in a small thread pool so reads overlap on slow disks
+    # or network mounts, then merge the per-file partials
+    with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as ex:
+        for file_token, file_route, file_hour, file_total in ex.map(_scan_file, csv_files):
+            _merge_stats(by_token, file_token)
+            _merge_stats(by_route, file_route)
+            for hour, profits in file_hour.items():
+                by_hour[hour].extend(profits)
+            total += file_total
+
+    if not total:
         print("No opportunities found in CSV files!")
         return
-    
-    # Analyze by token
-    by_token = defaultdict(list)
-    by_route = defaultdict(list)
-    
-    for opp in all_opportunities:
-        by_token[opp['symbol']].append(opp)
-        route = f"{opp['buy_on']} -> {opp['sell_on']}"
-        by_route[route].append(opp)
-    
-    print(f"📊 Arbitrage Opportunity Analysis")
-    print(f"📅 Total opportunities found: {len(all_opportunities)}")
-    print("=" * 60)
-    
+
+    # Build the whole report in memory and emit it in one write, so a
+    # large token/route history doesn't mean hundreds of line-buffered
+    # stdout flushes (noticeable over ssh and piped output)
+    lines = [
+        "📊 Arbitrage Opportunity Analysis",
+        f"📅 Total opportunities found: {total}",
+        "=" * 60,
+    ]
+
     # Token analysis
-    print("\n💰 By Token:")
-    print(f"{'Token':<10} {'Count':<10} {'Avg Profit':<12} {'Max Profit':<12} {'Avg Diff %'}")
-    print("-" * 60)
-    
-    for token, opps in sorted(by_token.items(), key=lambda x: len(x[1]), reverse=True):
-        profits = [o['net_profit'] for o in opps]
-        diffs = [o['price_diff_pct'] for o in opps]
-        print(f"{token:<10} {len(opps):<10} ${statistics.mean(profits):<11.2f} ${max(profits):<11.2f} {statistics.mean(diffs):.2f}%")
-    
+    lines.append("\n💰 By Token:")
+    lines.append(f"{'Token':<10} {'Count':<10} {'Avg Profit':<12} {'Max Profit':<12} {'Avg Diff %'}")
+    lines.append("-" * 60)
+
+    for token, s in sorted(by_token.items(), key=lambda kv: -kv[1][0]):
+        count, profit_sum, profit_max, diff_sum = s
+        lines.append(f"{token:<10} {count:<10} ${profit_sum / count:<11.2f} ${profit_max:<11.2f} {diff_sum / count:.2f}%")
+
     # Route analysis
-    print("\n🔄 By Route:")
-    print(f"{'Route':<20} {'Count':<10} {'Avg Profit':<12} {'Total Profit'}")
-    print("-" * 60)
-    
-    for route, opps in sorted(by_route.items(), key=lambda x: len(x[1]), reverse=True):
-        profits = [o['net_profit'] for o in opps]
-        total_profit = sum(profits)
-        print(f"{route:<20} {len(opps):<10} ${statistics.mean(profits):<11.2f} ${total_profit:.2f}")
-    
+    lines.append("\n🔄 By Route:")
+    lines.append(f"{'Route':<20} {'Count':<10} {'Avg Profit':<12} {'Total Profit'}")
+    lines.append("-" * 60)
+
+    for route, s in sorted(by_route.items(), key=lambda kv: -kv[1][0]):
+        count, profit_sum, _profit_max, _diff_sum = s
+        lines.append(f"{route:<20} {count:<10} ${profit_sum / count:<11.2f} ${profit_sum:.2f}")
+
     # Time analysis
-    print("\n⏰ Best Times:")
-    by_hour = defaultdict(list)
-    for opp in all_opportunities:
-        hour = datetime.strptime(opp['timestamp'], '%Y-%m-%d %H:%M:%S').hour
-        by_hour[hour].append(opp['net_profit'])
-    
-    print(f"{'Hour (UTC)':<12} {'Opportunities':<15} {'Avg Profit'}")
-    print("-" * 40)
-    
+    lines.append("\n⏰ Best Times:")
+    lines.append(f"{'Hour (UTC)':<12} {'Opportunities':<15} {'Avg Profit'}")
+    lines.append("-" * 40)
+
     for hour in sorted(by_hour.keys()):
         profits = by_hour[hour]
-        print(f"{hour:02d}:00-{hour:02d}:59  {len(profits):<15} ${statistics.mean(profits):.2f}")
+        lines.append(f"{hour:02d}:00-{hour:02d}:59  {len(profits):<15} ${sum(profits) / len(profits):.2f}")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 if __name__ == "__main__":
     analyze_opportunities()
\ No newline at end of file
@@ -4,12 +4,24 @@ Standalone balance checker - no import issues
 """
 
 import asyncio
+import base64
 import json
 import os
 from solana.rpc.async_api import AsyncClient
 from solders.keypair import Keypair
 import base58
 
+# Fast JSON parse when orjson is installed, stdlib otherwise — same
+# pattern as the bot itself
+try:
+    import orjson
+
+    def json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def json_loads(data):
+        return json.loads(data)
+
 async def check_balances():
     """Check SOL and token balances"""
     # Load wallet
@@ -20,9 +32,15 @@ async def check_balances():
         return
     
     try:
-        with open(wallet_path, 'r') as f:
-            wallet_data = json.load(f)
-            keypair = Keypair.from_bytes(base58.b58decode(wallet_data['secret_key']))
+        with open(wallet_path, 'rb') as f:
+            wallet_data = json_loads(f.read())
+        # Newer wallets carry a base64 copy of the secret key; decoding
+        # it is C-speed, unlike the per-character base58 loop
+        if 'secret_key_b64' in wallet_data:
+            secret = base64.b64decode(wallet_data['secret_key_b64'])
+        else:
+            secret = base58.b58decode(wallet_data['secret_key'])
+        keypair = Keypair.from_bytes(secret)
     except Exception as e:
         print(f"❌ Error loading wallet: {e}")
         return
@@ -30,9 +48,9 @@ async def check_balances():
     # Load config for RPC endpoint
     config_path = 'config/config.json'
     if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            rpc_endpoint = config.get('rpc_endpoint', 'https://api.mainnet-beta.solana.com')
+        with open(config_path, 'rb') as f:
+            config = json_loads(f.read())
+        rpc_endpoint = config.get('rpc_endpoint', 'https://api.mainnet-beta.solana.com')
     else:
         rpc_endpoint = 'https://api.mainnet-beta.solana.com'
     
@@ -45,17 +63,16 @@ async def check_balances():
     client = AsyncClient(rpc_endpoint)
     
     try:
-        # Test connection
-        print("Testing connection...")
-        is_connected = await client.is_connected()
-        if not is_connected:
-            print("❌ Cannot connect to Solana RPC")
-            return
-            
-        # Get SOL balance
+        # No separate liveness probe: the balance fetch below exercises
+        # the connection anyway and raises if the RPC is unreachable
         print(f"\n💳 Wallet: {keypair.pubkey()}")
-        
-        balance_response = await client.get_balance(keypair.pubkey())
+
+        # Balance and blockhash are independent round-trips; fire them
+        # together so the wall-clock cost is one RTT, not two
+        balance_response, blockhash_resp = await asyncio.gather(
+            client.get_balance(keypair.pubkey()),
+            client.get_latest_blockhash()
+        )
         sol_balance = balance_response.value / 1e9
         
         print(f"💰 SOL Balance: {sol_balance:.4f} SOL")
@@ -74,8 +91,7 @@ async def check_balances():
         else:
             print("✅ SOL balance sufficient for trading")
         
-        # Get recent blockhash to verify connection
-        blockhash_resp = await client.get_latest_blockhash()
+        # Recent blockhash (fetched above) verifies the connection
         print(f"\n🔗 Connected to Solana (slot: {blockhash_resp.context.slot})")
         
         print("\n💡 Next steps:")
@@ -6,24 +6,34 @@ import json
 import sys
 from datetime import datetime
 
+# Module-level session so repeated polls (cron/watch) reuse the TCP
+# connection instead of handshaking per call
+_session = requests.Session()
+
 def check_health():
     """Check bot health via metrics endpoint"""
     try:
         # Check metrics endpoint
-        response = requests.get('http://localhost:8000/metrics', timeout=5)
+        response = _session.get('http://localhost:8000/metrics', timeout=5)
         if response.status_code != 200:
             print(f"❌ Metrics endpoint returned {response.status_code}")
             return False
         
-        # Parse metrics
-        metrics = response.text
-        
+        # Parse the raw bytes once into a set of metric names; staying
+        # on response.content skips decoding the whole payload to str,
+        # and each check is an exact O(1) lookup
+        names = {
+            line.split(b'{', 1)[0].split(b' ', 1)[0]
+            for line in response.content.splitlines()
+            if line and not line.startswith(b'#')
+        }
+
         # Check key metrics
         checks = {
-            'Bot Running': 'arbitrage_' in metrics,
-            'Trades Metric': 'arbitrage_trades_total' in metrics,
-            'Balance Metric': 'wallet_balance_usd' in metrics,
-            'Opportunities Metric': 'arbitrage_opportunities_active' in metrics
+            'Bot Running': any(n.startswith(b'arbitrage_') for n in names),
+            'Trades Metric': b'arbitrage_trades_total' in names,
+            'Balance Metric': b'wallet_balance_usd' in names,
+            'Opportunities Metric': b'arbitrage_opportunities_active' in names
         }
         
         all_good = True
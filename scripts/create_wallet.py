@@ -2,12 +2,24 @@
 #!/usr/bin/env python3
 """Create a new Solana wallet for the arbitrage bot"""
 
+import base64
 import json
 import base58
 from solders.keypair import Keypair
 import os
 import sys
 
+# Fast JSON dump when orjson is installed, stdlib otherwise — same
+# pattern as the bot itself
+try:
+    import orjson
+
+    def json_dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
 def create_new_wallet():
     """Create a new Solana wallet"""
     print("🔑 Creating new Solana wallet...")
@@ -19,9 +31,12 @@ def create_new_wallet():
     secret_key = base58.b58encode(bytes(keypair)).decode('utf-8')
     public_key = str(keypair.pubkey())
     
-    # Create wallet data
+    # Create wallet data. The base64 copy of the secret key lets
+    # loaders skip the much slower base58 decode; the base58 field
+    # stays for compatibility with existing wallets and tooling
     wallet_data = {
         "secret_key": secret_key,
+        "secret_key_b64": base64.b64encode(bytes(keypair)).decode('utf-8'),
         "public_key": public_key,
         "warning": "NEVER share this file or commit it to git!"
     }
@@ -35,7 +50,7 @@ def create_new_wallet():
     
     # Save wallet
     with open('wallet.json', 'w') as f:
-        json.dump(wallet_data, f, indent=2)
+        f.write(json_dumps_pretty(wallet_data))
     
     # Set proper permissions (Unix-like systems only)
     try:
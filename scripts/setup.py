@@ -2,6 +2,8 @@
 #!/usr/bin/env python3
 """Setup script for the arbitrage bot"""
 
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
 setup(
@@ -13,7 +15,7 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         line.strip()
-        for line in open("requirements.txt")
+        for line in Path("requirements.txt").read_text().splitlines()
         if line.strip() and not line.startswith("#")
     ],
     python_requires=">=3.9",
@@ -1,22 +1,52 @@
-# ===== src/__init__.py =====
-"""
-Solana Arbitrage Bot Package
-
-A production-ready arbitrage bot for Solana DEXs.
-"""
-
-__version__ = "2.0.0"
-__author__ = "Solana Arbitrage Bot Team"
-
-# Import main components for easier access
-from .arbitrage_bot import ProductionArbitrageBot
-from .simple_monitor import SimpleArbitrageMonitor
-from .config import get_config, initialize_config
-from .constants import *
-
-__all__ = [
-    'ProductionArbitrageBot',
-    'SimpleArbitrageMonitor',
-    'get_config',
-    'initialize_config',
-]
\ No newline at end of file
+# ===== src/__init__.py =====
+"""
+Solana Arbitrage Bot Package
+
+A production-ready arbitrage bot for Solana DEXs.
+"""
+
+__version__ = "2.0.0"
+__author__ = "Solana Arbitrage Bot Team"
+
+# Lazy attribute loading (PEP 562): importing the package no longer
+# drags in solana/solders/monitoring machinery. Submodules such as
+# src.constants or src.modules.* import directly without paying for
+# the bot classes; the symbols below resolve on first access.
+_LAZY_IMPORTS = {
+    'ProductionArbitrageBot': '.arbitrage_bot',
+    'SimpleArbitrageMonitor': '.simple_monitor',
+    'get_config': '.config',
+    'initialize_config': '.config',
+}
+
+__all__ = [
+    'ProductionArbitrageBot',
+    'SimpleArbitrageMonitor',
+    'get_config',
+    'initialize_config',
+]
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        # Constants were previously star-imported here; keep them
+        # reachable as src.<NAME> without importing them eagerly
+        if not name.startswith('_'):
+            constants = import_module('.constants', __name__)
+            if hasattr(constants, name):
+                value = getattr(constants, name)
+                globals()[name] = value
+                return value
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cache so __getattr__ runs once per symbol
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -13,8 +13,9 @@ from dataclasses import dataclass
 
 # Import the main bot
 from arbitrage_bot import (
-    ProductionArbitrageBot, 
+    ProductionArbitrageBot,
     ArbitrageOpportunity,
+    ArbitrageDatabase,
     Token,
     DEX,
     TradeResult,
@@ -587,6 +588,50 @@ class TestDatabase:
         assert row[12] == "test_sell_tx_456"
         assert row[13] == 1  # success = True
 
+    @pytest.mark.asyncio
+    async def test_shutdown_flush_preserves_queued_writes(self, tmp_path):
+        """Rows the flusher popped but hadn't committed survive shutdown"""
+        db = ArbitrageDatabase(str(tmp_path / "test.db"))
+        token = Token("TEST", "TestMint", 9, 1000)
+        # Floats, as the scanner produces them - sqlite binds them directly
+        opp = ArbitrageOpportunity(
+            id="test_shutdown_001",
+            token=token,
+            buy_dex=DEX.JUPITER,
+            sell_dex=DEX.RAYDIUM,
+            buy_price=1.00,
+            sell_price=1.05,
+            size_usd=1000.0,
+            expected_profit=45.0,
+            price_impact=0.005,
+            timestamp=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=10)
+        )
+
+        await db.save_opportunity(opp)
+        # Land inside the flusher's 50ms coalescing window: it has
+        # popped the row off the queue but not committed the batch yet
+        await asyncio.sleep(0.01)
+
+        # Same sequence as the bot's shutdown path: cancel, wait for the
+        # tasks to actually exit (requeuing their in-hand rows), flush
+        tasks = [t for t in (db._flusher_task, db._metrics_task) if t]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await db.flush()
+
+        import sqlite3
+        conn = sqlite3.connect(db.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM opportunities WHERE id = ?", (opp.id,))
+        row = cursor.fetchone()
+        conn.close()
+        db.close()
+
+        assert row is not None
+        assert row[0] == "test_shutdown_001"
+
 # Performance benchmark script
 async def run_performance_benchmark():
     """Run performance benchmarks"""